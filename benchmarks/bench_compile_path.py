@@ -0,0 +1,46 @@
+"""
+Compares compile_path() accessors with getitem(path) over a list of nested
+records.
+
+    python -m benchmarks.bench_compile_path [size]
+"""
+
+import sys
+from timeit import Timer
+from typing import Callable, List, Tuple
+
+from ftools.collection import compile_path, getitem
+from ftools.iterable import group_by, key_by
+
+PATH = ("user", "address", "city")
+
+
+def create_records(size: int) -> List[dict]:
+    return [
+        {"id": index, "user": {"address": {"city": f"city-{index % 100}"}}}
+        for index in range(size)
+    ]
+
+
+def main(size: int = 1000000) -> None:
+    records = create_records(size)
+    compiled = compile_path(PATH)
+    cases: List[Tuple[str, Callable]] = [
+        ("map(getitem(path))", lambda: list(map(getitem(PATH), records))),
+        ("map(compiled)", lambda: list(map(compiled, records))),
+        ("map(compiled.get)", lambda: list(map(compiled.get, records))),
+        ("map(compiled.has)", lambda: list(map(compiled.has, records))),
+        ("group_by(getitem(path))", lambda: group_by(getitem(PATH), records)),
+        ("group_by(compiled.get)", lambda: group_by(compiled.get, records)),
+        ("key_by(getitem(path))", lambda: key_by(getitem(PATH), records)),
+        ("key_by(compiled.get)", lambda: key_by(compiled.get, records)),
+    ]
+    print(f"{size} records")
+    print(f"{'case':<28}{'total (s)':>12}{'per record (ns)':>18}")
+    for name, case in cases:
+        seconds = min(Timer(case).repeat(repeat=3, number=1))
+        print(f"{name:<28}{seconds:>12.3f}{seconds / size * 1e9:>18.0f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
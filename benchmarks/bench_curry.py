@@ -0,0 +1,68 @@
+"""
+Measures the per call overhead curry() adds to the curried functions ftools
+ships, compared to calling the raw function, both for saturated calls and for
+completing a prebuilt partial application.
+
+    python -m benchmarks.bench_curry
+"""
+
+from timeit import Timer
+from typing import Callable, List, Tuple
+
+from ftools import collection, iterable, mapping
+
+DOCUMENT = {"a": {"b": [1, 2, 3]}, "c": 4}
+RECORDS = [{"id": index, "group": index % 3} for index in range(10)]
+MAPPING = {"a": 1, "b": 2, "c": 3}
+
+CASES: List[Tuple[str, Callable, tuple]] = [
+    ("collection.getitem", collection.getitem, (("a", "b", 0), DOCUMENT)),
+    ("collection.hasitem", collection.hasitem, (("a", "b", 0), DOCUMENT)),
+    ("collection.setitem", collection.setitem, (("a", "b", 0), 5, DOCUMENT)),
+    ("collection.delitem", collection.delitem, ("c", DOCUMENT)),
+    ("collection.update", collection.update, ("c", str, DOCUMENT)),
+    ("iterable.find", iterable.find, (bool, RECORDS)),
+    ("iterable.find_index", iterable.find_index, (bool, RECORDS)),
+    ("iterable.group_by", iterable.group_by, (len, RECORDS)),
+    ("iterable.flat_group_by", iterable.flat_group_by, (len, RECORDS)),
+    ("iterable.intersection", iterable.intersection, ((1, 2), (2, 3))),
+    ("iterable.chunk_by", iterable.chunk_by, (max, (1, 2))),
+    ("iterable.chunk", iterable.chunk, (2, (1, 2))),
+    ("mapping.pick", mapping.pick, (("a",), MAPPING)),
+    ("mapping.pick_by_value", mapping.pick_by_value, (bool, MAPPING)),
+    ("mapping.pick_by_key", mapping.pick_by_key, (bool, MAPPING)),
+    ("mapping.omit", mapping.omit, (("a",), MAPPING)),
+    ("mapping.map_values", mapping.map_values, (str, MAPPING)),
+    ("mapping.map_keys", mapping.map_keys, (str, MAPPING)),
+]
+
+
+PARTIAL_CASES: List[Tuple[str, Callable, tuple, tuple]] = [
+    ("collection.getitem(path)", collection.getitem, (("a", "b", 0),), (DOCUMENT,)),
+    ("iterable.group_by(key)", iterable.group_by, (len,), (RECORDS,)),
+    ("mapping.pick(keys)", mapping.pick, (("a",),), (MAPPING,)),
+]
+
+
+def per_call(func: Callable, args: tuple, number: int) -> float:
+    """
+    Best of five timings of a single call in nanoseconds
+    """
+    timer = Timer(lambda: func(*args))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main(number: int = 20000) -> None:
+    print(f"{'function':<28}{'raw (ns)':>12}{'curried (ns)':>14}{'overhead':>12}")
+    for name, curried, args in CASES:
+        raw = per_call(curried.__wrapped__, args, number)
+        total = per_call(curried, args, number)
+        print(f"{name:<28}{raw:>12.0f}{total:>14.0f}{total - raw:>12.0f}")
+    for name, curried, first, rest in PARTIAL_CASES:
+        raw = per_call(curried.__wrapped__, first + rest, number)
+        total = per_call(curried(*first), rest, number)
+        print(f"{name:<28}{raw:>12.0f}{total:>14.0f}{total - raw:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
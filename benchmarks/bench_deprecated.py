@@ -0,0 +1,79 @@
+"""
+Compares the cost per call of a deprecated() function with the baseline
+deprecated(), which warned on every call, and with calling warnings.warn
+on every call, from one thread and from several threads calling
+different deprecated functions.
+
+    python -m benchmarks.bench_deprecated
+"""
+
+import warnings
+from functools import wraps
+from threading import Thread
+from time import perf_counter
+from timeit import Timer
+from typing import Callable, List
+
+from ftools.callable import deprecated, fullname
+
+
+def baseline_deprecated(func: Callable) -> Callable:
+    """
+    deprecated() before call sites were counted, warning on every call
+    """
+    func_name = fullname(func)
+
+    @wraps(func)
+    def decorated(*args, **kwargs):
+        warnings.warn(f"{func_name} is deprecated", DeprecationWarning)
+        return func(*args, **kwargs)
+
+    return decorated
+
+
+def warn_every_call(func: Callable) -> Callable:
+    @wraps(func)
+    def decorated(*args, **kwargs):
+        warnings.warn("deprecated", DeprecationWarning, stacklevel=2)
+        return func(*args, **kwargs)
+
+    return decorated
+
+
+def increment(value: int) -> int:
+    return value + 1
+
+
+def _threaded(funcs: List[Callable], number: int) -> float:
+    def call(func: Callable) -> None:
+        for _ in range(number):
+            func(0)
+
+    threads = [Thread(target=call, args=(func,)) for func in funcs]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (perf_counter() - start) / (number * len(funcs))
+
+
+def main(number: int = 200000, threads: int = 4) -> None:
+    warnings.simplefilter("ignore")
+    decorators = (
+        ("undecorated", lambda func: func),
+        ("warnings.warn", warn_every_call),
+        ("baseline", baseline_deprecated),
+        ("deprecated", deprecated),
+    )
+    print(f"{'':<16}{'1 thread (ns)':>16}{f'{threads} threads (ns)':>18}")
+    for name, decorator in decorators:
+        decorated = decorator(increment)
+        single = min(Timer(lambda: decorated(0)).repeat(repeat=5, number=number))
+        funcs = [decorator(increment) for _ in range(threads)]
+        threaded = min(_threaded(funcs, number // threads) for _ in range(3))
+        print(f"{name:<16}{single / number * 1e9:>16.0f}{threaded * 1e9:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Compares applying a flow() composition with the reduce() based application
+it replaced, for chains of 1 to 8 functions.
+
+    python -m benchmarks.bench_flow
+"""
+
+from functools import reduce
+from timeit import Timer
+
+from ftools.callable import flow
+
+
+def increment(value: int) -> int:
+    return value + 1
+
+
+def main(number: int = 200000) -> None:
+    print(f"{'functions':<12}{'reduce (ns)':>14}{'flow (ns)':>12}")
+    for size in (1, 2, 3, 4, 8):
+        funcs = [increment] * size
+        composed = flow(funcs)
+        reduced = min(
+            Timer(lambda: reduce(lambda acc, func: func(acc), funcs, 0)).repeat(
+                repeat=5, number=number
+            )
+        )
+        flowed = min(Timer(lambda: composed(0)).repeat(repeat=5, number=number))
+        print(
+            f"{size:<12}{reduced / number * 1e9:>14.0f}{flowed / number * 1e9:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Compares getitem_many() with calling getitem() for every path of every
+record.
+
+    python -m benchmarks.bench_getitem_many [size]
+"""
+
+import sys
+from timeit import Timer
+
+from ftools.collection import getitem, getitem_many
+from .bench_compile_path import create_records
+
+PATHS = [
+    ("id",),
+    ("user", "address", "city"),
+    ("user", "address", "zip"),
+    ("user", "name"),
+]
+
+
+def main(size: int = 1000000) -> None:
+    records = create_records(size)
+
+    def per_path():
+        return [[getitem(path, record) for record in records] for path in PATHS]
+
+    def batched():
+        return getitem_many(PATHS, records)
+
+    assert per_path() == batched()
+    print(f"{size} records, {len(PATHS)} paths")
+    for name, case in (("getitem per path", per_path), ("getitem_many", batched)):
+        seconds = min(Timer(case).repeat(repeat=3, number=1))
+        print(f"{name:<20}{seconds:>10.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
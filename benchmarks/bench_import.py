@@ -0,0 +1,73 @@
+"""
+Measures the time it takes a fresh interpreter to import ftools and use
+parts of it, over an interpreter that imports nothing, and lists the
+slowest imports reported by python -X importtime.
+
+    python -m benchmarks.bench_import [runs]
+"""
+
+import subprocess
+import sys
+from time import perf_counter
+from typing import List, Tuple
+
+STATEMENTS = (
+    "import ftools",
+    "import ftools; ftools.getitem",
+    "import ftools; ftools.group_by",
+    "import ftools.collection",
+    "import ftools.iterable",
+    "import ftools.callable",
+    "import ftools.aiterable",
+    "import ftools.parallel",
+)
+
+
+def run_seconds(statement: str, runs: int) -> float:
+    """
+    Best wall clock seconds of running statement in a new interpreter
+    """
+    timings = []
+    for _ in range(runs):
+        start = perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def slowest_imports(statement: str, count: int = 3) -> List[Tuple[str, int]]:
+    """
+    The top level imports of statement with the largest cumulative
+    microseconds according to python -X importtime
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        imports.append((name.strip(), int(cumulative)))
+    return sorted(imports, key=lambda item: -item[1])[:count]
+
+
+def main(runs: int = 10) -> None:
+    baseline = run_seconds("pass", runs)
+    print(f"{'statement':<36}{'import (ms)':>12}  slowest imports (ms)")
+    for statement in STATEMENTS:
+        seconds = run_seconds(statement, runs) - baseline
+        slowest = ", ".join(
+            f"{name} {microseconds / 1000:.1f}"
+            for name, microseconds in slowest_imports(statement)
+        )
+        print(f"{statement:<36}{seconds * 1000:>12.1f}  {slowest}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
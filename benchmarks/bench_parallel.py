@@ -0,0 +1,42 @@
+"""
+Compares the parallel group_by() with the serial one for a CPU bound iteratee
+at 1, 2, 4 and 8 workers.
+
+    python -m benchmarks.bench_parallel [size]
+"""
+
+import sys
+from hashlib import sha256
+from timeit import Timer
+
+from ftools import iterable, parallel
+
+WORKERS = (1, 2, 4, 8)
+
+
+def bucket(value: int) -> int:
+    digest = str(value).encode()
+    for _ in range(50):
+        digest = sha256(digest).digest()
+    return digest[0] % 16
+
+
+def main(size: int = 200000) -> None:
+    values = list(range(size))
+    expected = iterable.group_by(bucket, values)
+    serial = min(Timer(lambda: iterable.group_by(bucket, values)).repeat(3, 1))
+    print(f"{size} items")
+    print(f"{'serial':<20}{serial:>10.3f}s")
+    for workers in WORKERS:
+        assert parallel.group_by(bucket, values, workers=workers) == expected
+        seconds = min(
+            Timer(lambda: parallel.group_by(bucket, values, workers=workers)).repeat(
+                3, 1
+            )
+        )
+        name = f"{workers} workers"
+        print(f"{name:<20}{seconds:>10.3f}s{serial / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
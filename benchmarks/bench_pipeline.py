@@ -0,0 +1,48 @@
+"""
+Compares a fused Pipeline with flow() over the same stages.
+
+    python -m benchmarks.bench_pipeline [size]
+"""
+
+import sys
+from functools import partial
+from timeit import Timer
+from typing import Dict, List
+
+from ftools.callable import flow
+from ftools.iterable import chunk, compact, uniq
+from ftools.pipeline import Pipeline
+
+FUNCS = [
+    compact,
+    partial(map, lambda value: value * 2),
+    partial(filter, lambda value: value % 3),
+    uniq,
+    partial(map, lambda value: value + 1),
+    chunk(100),
+    list,
+]
+
+
+def main(size: int = 1000000) -> None:
+    values = [value % 50000 - 1000 for value in range(size)]
+    pipeline = Pipeline.from_funcs(FUNCS)
+    assert pipeline(values) == flow(FUNCS, values)
+    print(f"{size} items")
+    print(pipeline.explain())
+    cases = (
+        ("flow", Timer(lambda: flow(FUNCS, values))),
+        ("Pipeline", Timer(lambda: pipeline(values))),
+    )
+    # Runs alternate so both cases see the same load on the machine
+    runs: Dict[str, List[float]] = {name: [] for name, _ in cases}
+    for _ in range(10):
+        for name, timer in cases:
+            runs[name].append(timer.timeit(1))
+    seconds = {name: min(times) for name, times in runs.items()}
+    for name, _ in cases:
+        print(f"{name:<20}{seconds[name]:>10.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""
+Runs the benchmark suite and writes a JSON report, for tracking the
+performance of ftools over commits.
+
+    python -m benchmarks.report [--max-size N] [--case NAME] [--no-memory] [--output FILE]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from .suite import CASES, SIZES, run
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=SIZES[-1],
+        help="the largest input size or depth to run",
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        choices=[case.name for case in CASES],
+        help="run only given cases",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip tracemalloc measurements"
+    )
+    parser.add_argument("--output", help="write the report to a file")
+    arguments = parser.parse_args(argv)
+
+    cases = [
+        case for case in CASES if not arguments.case or case.name in arguments.case
+    ]
+    report = {
+        "commit": _commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": run(cases, arguments.max_size, not arguments.no_memory),
+    }
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+The benchmark cases tracked over commits: ftools functions next to plain
+Python and, when installed, toolz equivalents, over input sizes from 10 to
+10⁶ elements or nesting depths from 1 to 50. See benchmarks.report for
+running them.
+"""
+
+import tracemalloc
+from dataclasses import dataclass
+from itertools import groupby
+from timeit import Timer
+from typing import Any, Callable, Dict, List, Tuple
+
+from ftools.callable import curry
+from ftools.collection import branches, setitem
+from ftools.iterable import chunk_by, group_by, intersection
+from ftools.mapping import pick
+
+try:
+    import toolz
+except ImportError:  # pragma: no cover
+    toolz = None
+
+SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+DEPTHS = (1, 5, 10, 25, 50)
+
+
+@dataclass(frozen=True)
+class Case:
+    """
+    A benchmark: setup creates the input for a size or depth, and every
+    implementation is called with that input
+    """
+
+    name: str
+    parameter: str
+    values: Tuple[int, ...]
+    setup: Callable[[int], Any]
+    implementations: Dict[str, Callable[[Any], Any]]
+
+
+def seconds_per_call(func: Callable[[Any], Any], argument: Any) -> float:
+    """
+    Best of three timings of a single call, each timing running enough calls
+    to take at least 0.2 seconds
+    """
+    timer = Timer(lambda: func(argument))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def peak_memory(func: Callable[[Any], Any], argument: Any) -> int:
+    """
+    The peak bytes allocated during a single call, including its result
+    """
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = func(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - before
+
+
+def _add(a: int, b: int, c: int) -> int:
+    return a + b + c
+
+
+_curried_add = curry(_add)
+
+
+def _nested(depth: int) -> dict:
+    document: dict = {"value": 0}
+    for level in range(depth):
+        document = {"child": document, "sibling": {"level": level}, "value": level}
+    return document
+
+
+def _python_setitem(path: tuple, value: Any, document: dict) -> dict:
+    root = dict(document)
+    current = root
+    for key in path[:-1]:
+        child = dict(current.get(key, {}))
+        current[key] = child
+        current = child
+    current[path[-1]] = value
+    return root
+
+
+def _python_branches(collection: Any, path: tuple = ()) -> List[Tuple[tuple, Any]]:
+    found = []
+    stack = [(path, collection)]
+    while stack:
+        current_path, current = stack.pop()
+        if isinstance(current, dict):
+            children = current.items()
+        elif isinstance(current, list):
+            children = enumerate(current)
+        else:
+            continue
+        for key, value in children:
+            child_path = current_path + (key,)
+            found.append((child_path, value))
+            stack.append((child_path, value))
+    return found
+
+
+def _python_group_by(records: List[dict]) -> Dict[int, List[dict]]:
+    groups: Dict[int, List[dict]] = {}
+    for record in records:
+        groups.setdefault(record["group"], []).append(record)
+    return groups
+
+
+def _python_intersection(args: Tuple[List[int], List[int]]) -> List[int]:
+    source, target = args
+    target_set = set(target)
+    return list(dict.fromkeys(value for value in source if value in target_set))
+
+
+def _chunk_identity(item: int, _index: int) -> int:
+    return item // 7
+
+
+def _records(size: int) -> List[dict]:
+    return [{"id": index, "group": index % 100} for index in range(size)]
+
+
+def _overlapping(size: int) -> Tuple[List[int], List[int]]:
+    return list(range(size)), list(range(size // 2, size + size // 2))
+
+
+def _mapping_and_keys(size: int) -> Tuple[List[str], Dict[str, int]]:
+    mapping = {str(index): index for index in range(size)}
+    return list(mapping)[::2], mapping
+
+
+def _cases() -> List[Case]:
+    cases = [
+        Case(
+            "curry",
+            "size",
+            SIZES,
+            lambda size: list(range(size)),
+            {
+                "ftools": lambda values: [_curried_add(1)(2)(v) for v in values],
+                "python": lambda values: [_add(1, 2, v) for v in values],
+            },
+        ),
+        Case(
+            "collection.setitem",
+            "depth",
+            DEPTHS,
+            lambda depth: (("child",) * depth + ("value",), _nested(depth)),
+            {
+                "ftools": lambda args: setitem(args[0], 1, args[1]),
+                "python": lambda args: _python_setitem(args[0], 1, args[1]),
+            },
+        ),
+        Case(
+            "collection.branches",
+            "depth",
+            DEPTHS,
+            lambda depth: [_nested(depth) for _ in range(100)],
+            {
+                "ftools": lambda documents: list(branches(documents)),
+                "python": _python_branches,
+            },
+        ),
+        Case(
+            "iterable.group_by",
+            "size",
+            SIZES,
+            _records,
+            {
+                "ftools": lambda records: group_by(
+                    lambda record: record["group"], records
+                ),
+                "python": _python_group_by,
+            },
+        ),
+        Case(
+            "iterable.intersection",
+            "size",
+            SIZES,
+            _overlapping,
+            {
+                "ftools": lambda args: list(intersection(*args)),
+                "python": _python_intersection,
+            },
+        ),
+        Case(
+            "iterable.chunk_by",
+            "size",
+            SIZES,
+            lambda size: list(range(size)),
+            {
+                "ftools": lambda values: list(chunk_by(_chunk_identity, values)),
+                "python": lambda values: [
+                    tuple(chunk)
+                    for _, chunk in groupby(values, key=lambda value: value // 7)
+                ],
+            },
+        ),
+        Case(
+            "mapping.pick",
+            "size",
+            SIZES,
+            _mapping_and_keys,
+            {
+                "ftools": lambda args: pick(*args),
+                "python": lambda args: {key: args[1].get(key) for key in args[0]},
+            },
+        ),
+    ]
+    if toolz is not None:
+        toolz_add = toolz.curry(_add)
+        toolz_implementations = {
+            "curry": lambda values: [toolz_add(1)(2)(v) for v in values],
+            "collection.setitem": lambda args: toolz.assoc_in(args[1], args[0], 1),
+            "iterable.group_by": lambda records: toolz.groupby("group", records),
+            "iterable.chunk_by": lambda values: list(
+                toolz.partitionby(lambda value: value // 7, values)
+            ),
+            "mapping.pick": lambda args: toolz.keyfilter(
+                set(args[0]).__contains__, args[1]
+            ),
+        }
+        for case in cases:
+            if case.name in toolz_implementations:
+                case.implementations["toolz"] = toolz_implementations[case.name]
+    return cases
+
+
+CASES = _cases()
+
+
+def run(
+    cases: List[Case] = CASES, max_value: int = SIZES[-1], memory: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Runs cases for every size or depth up to max_value and returns a result
+    per case, value and implementation
+    """
+    results = []
+    for case in cases:
+        for value in case.values:
+            if value > max_value:
+                continue
+            argument = case.setup(value)
+            for implementation, func in case.implementations.items():
+                result: Dict[str, Any] = {
+                    "case": case.name,
+                    case.parameter: value,
+                    "implementation": implementation,
+                    "seconds": seconds_per_call(func, argument),
+                }
+                if memory:
+                    result["peak_bytes"] = peak_memory(func, argument)
+                results.append(result)
+    return results
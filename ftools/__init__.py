@@ -0,0 +1,179 @@
+"""
+Functional utilities for Python. The public API of the ftools modules is
+available directly from ftools, and a module is only imported when one of
+its names is first accessed, so importing ftools costs next to nothing.
+"""
+
+from importlib import import_module
+
+# typing is not imported here: it alone costs more than the rest of this module
+
+# Public names by module. Names exported by several modules, like pick, are
+# not available from ftools itself, only from their modules.
+_MODULE_EXPORTS = (
+    (
+        "collection",
+        (
+            "CompiledPath",
+            "LinkedPath",
+            "branches",
+            "compile_path",
+            "delitem",
+            "getitem",
+            "getitem_many",
+            "hasitem",
+            "leaves",
+            "pick",
+            "setitem",
+            "setitems",
+            "to_path",
+            "update",
+        ),
+    ),
+    (
+        "iterable",
+        (
+            "FlatGroupBy",
+            "chunk",
+            "chunk_by",
+            "chunk_slices",
+            "compact",
+            "difference",
+            "difference_by",
+            "external_group_by",
+            "find",
+            "find_index",
+            "flat_group_by",
+            "flatten",
+            "group_by",
+            "group_by_sorted",
+            "group_reduce",
+            "head",
+            "index_of",
+            "intersection",
+            "intersection_by",
+            "key_by",
+            "mean",
+            "partition",
+            "starfilter",
+            "starreduce",
+            "symmetric_difference",
+            "symmetric_difference_by",
+            "union",
+            "union_by",
+            "uniq",
+            "uniq_by",
+        ),
+    ),
+    (
+        "mapping",
+        (
+            "create_empty",
+            "extract",
+            "is_dict",
+            "items",
+            "map_keys",
+            "map_values",
+            "omit",
+            "pick",
+            "pick_by_key",
+            "pick_by_value",
+        ),
+    ),
+    ("sequence", ("create_empty", "initial", "last", "omit", "pick")),
+    (
+        "callable",
+        (
+            "CacheInfo",
+            "CurriedPartial",
+            "Debounced",
+            "Flow",
+            "Memoized",
+            "compose",
+            "constant",
+            "curry",
+            "currymethod",
+            "debounce",
+            "default_key",
+            "deprecated",
+            "deprecation_usage",
+            "flow",
+            "fullname",
+            "graceful",
+            "graceful_stats",
+            "identity",
+            "memoize",
+            "noop",
+            "once",
+            "rename",
+            "star",
+            "throttle",
+        ),
+    ),
+    ("optional", ("ignore_optional", "is_some", "map_optionals")),
+    (
+        "persistent",
+        (
+            "PersistentMap",
+            "PersistentMapEvolver",
+            "PersistentVector",
+            "PersistentVectorEvolver",
+            "freeze",
+            "pmap",
+            "pvector",
+            "thaw",
+        ),
+    ),
+    ("stats", ("OnlineStats", "describe")),
+    ("pipeline", ("Pipeline",)),
+)
+
+_SUBMODULES = frozenset(
+    (
+        "aiterable",
+        "callable",
+        "collection",
+        "instrument",
+        "iterable",
+        "mapping",
+        "optional",
+        "parallel",
+        "persistent",
+        "pipeline",
+        "sequence",
+        "stats",
+    )
+)
+
+_MODULES_BY_NAME = {}
+for _module, _names in _MODULE_EXPORTS:
+    for _name in _names:
+        _MODULES_BY_NAME.setdefault(_name, []).append(_module)
+del _module, _names, _name
+
+_EXPORTS = {
+    _name: _modules[0]
+    for _name, _modules in _MODULES_BY_NAME.items()
+    if len(_modules) == 1
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    # Not cached in the module: instrument.enable() and disable() replace the
+    # functions of the modules
+    if name in _EXPORTS:
+        return getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    if name in _SUBMODULES:
+        return import_module(f"{__name__}.{name}")
+    if name in _MODULES_BY_NAME:
+        modules = ", ".join(f"{__name__}.{module}" for module in _MODULES_BY_NAME[name])
+        raise AttributeError(
+            f"{name!r} is exported by several modules, import it from one of {modules}"
+        )
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
@@ -0,0 +1,322 @@
+"""
+Utilities for asynchronous iterables. Functions accept async iterables as
+well as plain iterables, and iteratees may be plain or async functions.
+"""
+
+import asyncio
+from collections import abc, deque
+from inspect import isawaitable
+from math import nan
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .callable import _NO_VALUE, curry, identity
+from .iterable import ATOMS, _check_chunk_size
+
+# group_by, chunk_by and uniq_by repeat the loops of their ftools.iterable
+# counterparts with awaited iteratees, an async for can't share a loop body
+# with a plain one
+# pylint: disable=duplicate-code
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+G = TypeVar("G")  # pylint: disable=invalid-name
+R = TypeVar("R")  # pylint: disable=invalid-name
+Key = TypeVar("Key")
+Identity = TypeVar("Identity")
+
+AnyIterable = Union[AsyncIterable[T], Iterable[T]]
+MaybeAwaitable = Union[Awaitable[T], T]
+
+
+async def _resolve(value: MaybeAwaitable[T]) -> T:
+    if isawaitable(value):
+        return await value  # type: ignore
+    return value  # type: ignore
+
+
+async def _call(func: Callable[..., MaybeAwaitable[R]], *args) -> R:
+    return await _resolve(func(*args))
+
+
+async def _from_iterable(iterable: Iterable[T]) -> AsyncIterator[T]:
+    for item in iterable:
+        yield item
+
+
+def to_async(iterable: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Returns an async iterator over given async or plain iterable
+    """
+    # aiter() is only built in since Python 3.10, and Python 3.6 is supported
+    # pylint: disable=unnecessary-dunder-call
+    if isinstance(iterable, abc.AsyncIterable):
+        return iterable.__aiter__()
+    return _from_iterable(iterable).__aiter__()
+
+
+async def to_list(iterable: AnyIterable[T]) -> List[T]:
+    """
+    Collects the elements of given async or plain iterable into a list
+    """
+    return [item async for item in to_async(iterable)]
+
+
+async def compact(iterable: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Creates an async iterable with all falsey values removed.
+    """
+    async for item in to_async(iterable):
+        if item:
+            yield item
+
+
+async def head(iterable: AnyIterable[T]) -> Optional[T]:
+    """
+    Gets the first element of iterable.
+    Defaults to None.
+    """
+    async for item in to_async(iterable):
+        return item
+    return None
+
+
+@curry
+async def find(
+    comparator: Callable[[T], MaybeAwaitable[bool]], iterable: AnyIterable[T]
+) -> Optional[T]:
+    """
+    Iterates over elements of iterable, returning the first element predicate returns truthy for.
+    Defaults to None.
+    """
+    async for item in to_async(iterable):
+        if await _call(comparator, item):
+            return item
+    return None
+
+
+@curry
+async def find_index(
+    comparator: Callable[[T], MaybeAwaitable[bool]], iterable: AnyIterable[T]
+) -> Optional[int]:
+    """
+    This method is like find() except that it returns the index of the first element predicate
+    returns truthy for instead of the element itself.
+    """
+    index = 0
+    async for item in to_async(iterable):
+        if await _call(comparator, item):
+            return index
+        index += 1
+    return None
+
+
+async def mean(iterable: AnyIterable[Union[int, float]]) -> float:
+    """
+    Computes the mean of the values in iterable in a single pass.
+    Returns nan for an empty iterable.
+    """
+    total: Union[int, float] = 0
+    size = 0
+    async for value in to_async(iterable):
+        total += value
+        size += 1
+    return total / size if size else nan
+
+
+async def flatten(
+    iterable: AnyIterable[Any],
+    depth: Optional[int] = None,
+    atoms: Tuple[type, ...] = ATOMS,
+) -> AsyncIterator[Any]:
+    """
+    Flattens iterable, recursively by default or up to depth levels deep.
+    Nested async and plain iterables are both flattened, instances of atoms
+    (str, bytes and mappings by default) are not.
+    """
+    stack = [to_async(iterable)]
+    while stack:
+        try:
+            # anext() is only built in since Python 3.10, and Python 3.6 is supported
+            # pylint: disable=unnecessary-dunder-call
+            item = await stack[-1].__anext__()
+        except StopAsyncIteration:
+            stack.pop()
+            continue
+        if (
+            isinstance(item, (abc.Iterable, abc.AsyncIterable))
+            and not isinstance(item, atoms)
+            and (depth is None or len(stack) <= depth)
+        ):
+            stack.append(to_async(item))
+        else:
+            yield item
+
+
+@curry
+async def group_by(
+    iteratee: Callable[[T], MaybeAwaitable[G]], iterable: AnyIterable[T]
+) -> Dict[G, List[T]]:
+    """
+    Creates a dictionary composed of keys generated from the results of
+    running each element of iterable thru iteratee. The order of grouped
+    values is determined by the order they occur in iterable.
+    """
+    groups: Dict[G, List[T]] = {}
+    async for item in to_async(iterable):
+        key = await _call(iteratee, item)
+        if not key:
+            continue
+        group = groups.setdefault(key, [])
+        group.append(item)
+    return groups
+
+
+@curry
+def chunk(size: int, iterable: AnyIterable[T]) -> AsyncIterator[Tuple[T, ...]]:
+    """
+    Creates an async iterable of elements split into groups the length of
+    size. If iterable can't be split evenly, the final chunk will be the
+    remaining elements.
+    """
+    _check_chunk_size(size)
+    return _chunk(size, iterable)
+
+
+async def _chunk(size: int, iterable: AnyIterable[T]) -> AsyncIterator[Tuple[T, ...]]:
+    current_chunk: List[T] = []
+    async for item in to_async(iterable):
+        current_chunk.append(item)
+        if len(current_chunk) == size:
+            yield tuple(current_chunk)
+            current_chunk = []
+    if current_chunk:
+        yield tuple(current_chunk)
+
+
+@curry
+async def chunk_by(
+    predicate: Callable[[T, int], MaybeAwaitable[Identity]], iterable: AnyIterable[T]
+) -> AsyncIterator[Tuple[T, ...]]:
+    """
+    Creates an async iterable of chunks of iterable defined by the identity
+    returned by given predicate function. Consecutive items with equal
+    identities share a chunk.
+    """
+    last_identity = None
+    current_chunk: List[T] = []
+    index = 0
+    async for item in to_async(iterable):
+        item_identity = await _call(predicate, item, index)
+        index += 1
+        if current_chunk and item_identity == last_identity:
+            current_chunk.append(item)
+        else:
+            if current_chunk:
+                yield tuple(current_chunk)
+            last_identity = item_identity
+            current_chunk = [item]
+    if current_chunk:
+        yield tuple(current_chunk)
+
+
+def uniq(iterable: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Returns a duplicate-free version of an iterable, using hash for equality
+    comparisons, in which only the first occurrence of each element is kept.
+    """
+    return uniq_by(identity, iterable)
+
+
+@curry
+async def uniq_by(
+    key: Callable[[T], MaybeAwaitable[Key]], iterable: AnyIterable[T]
+) -> AsyncIterator[T]:
+    """
+    This function is like uniq except that it accepts iteratee which is invoked
+    for each element to generate the criterion by which uniqueness is computed.
+    """
+    seen: Set[Key] = set()
+    async for item in to_async(iterable):
+        k = await _call(key, item)
+        if k in seen:
+            continue
+        seen.add(k)
+        yield item
+
+
+@curry
+async def partition(
+    predicate: Callable[[T], MaybeAwaitable[bool]], iterable: AnyIterable[T]
+) -> Tuple[List[T], List[T]]:
+    """
+    Partition given iterable items to two lists: of items matching the
+    predicate function and items that do not.
+    """
+    matching: List[T] = []
+    non_matching: List[T] = []
+    async for item in to_async(iterable):
+        if await _call(predicate, item):
+            matching.append(item)
+        else:
+            non_matching.append(item)
+    return matching, non_matching
+
+
+@curry
+async def amap(
+    func: Callable[[T], MaybeAwaitable[R]],
+    iterable: AnyIterable[T],
+    *,
+    concurrency: int = 1,
+) -> AsyncIterator[R]:
+    """
+    Creates an async iterable of func(item) for every item of iterable, in
+    order. Up to concurrency calls run at the same time, and iterable is
+    consumed only as fast as results are taken.
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be positive, received {concurrency}")
+    pending: Deque[asyncio.Future] = deque()
+    try:
+        async for item in to_async(iterable):
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+            pending.append(asyncio.ensure_future(_call(func, item)))
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def flow(funcs: Iterable[Callable], value=_NO_VALUE):
+    """
+    Like ftools.callable.flow, but creates an async function that awaits the
+    result of every function that returns an awaitable before passing it on.
+    If value is given the coroutine invoking the functions with it is
+    returned.
+    """
+    snapshot = tuple(funcs)
+
+    async def composed(value):
+        for func in snapshot:
+            value = await _call(func, value)
+        return value
+
+    if value is _NO_VALUE:
+        return composed
+    return composed(value)
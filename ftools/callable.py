@@ -2,12 +2,45 @@
 Utilities for callables
 """
 
-import warnings
-from functools import partial, reduce, wraps
-from inspect import Parameter, getmodule, signature
-from logging import getLogger
-from time import time
-from typing import Callable, Iterable, Type, TypeVar, Union, cast
+import os
+import sys
+from collections import Counter, OrderedDict, namedtuple
+from functools import partial, update_wrapper, wraps
+from inspect import (
+    Parameter,
+    Signature,
+    getmodule,
+    isawaitable,
+    iscoroutinefunction,
+    signature,
+)
+from math import inf
+from threading import Lock, RLock, Timer
+from time import monotonic, perf_counter
+from types import CodeType
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+# asyncio, logging, random and warnings are imported where they are used so
+# importing ftools stays cheap for short lived processes
 
 
 def fullname(func: Callable) -> str:
@@ -35,6 +68,22 @@ def rename(new_name: str) -> Callable[[T], T]:
     return decorator
 
 
+def _named_after(wrapper: T, func: Callable) -> T:
+    """
+    Names the code of wrapper after func so profilers and tracebacks attribute
+    the wrapper's frames to func rather than to a generic inner function name
+    """
+    name = getattr(func, "__name__", None)
+    code = getattr(wrapper, "__code__", None)
+    if not isinstance(name, str) or not hasattr(code, "replace"):
+        return wrapper
+    changes = {"co_name": name}
+    if hasattr(code, "co_qualname"):
+        changes["co_qualname"] = getattr(func, "__qualname__", name)
+    wrapper.__code__ = code.replace(**changes)  # type: ignore
+    return wrapper
+
+
 def identity(arg: T) -> T:
     """
     This function returns the first argument it receives.
@@ -42,49 +91,208 @@ def identity(arg: T) -> T:
     return arg
 
 
-def deprecated(func: T) -> T:
+DEPRECATION_SCOPES = ("callsite", "process")
+DISABLE_DEPRECATED_ENV = "FTOOLS_DISABLE_DEPRECATED"
+
+# Code and call count by call site of deprecated() functions, by full name
+_deprecation_usage: Dict[str, List[Tuple[Lock, Dict[Tuple[int, int], list]]]] = {}
+_deprecation_lock = Lock()
+
+
+def deprecated(func: Optional[T] = None, *, scope: str = "callsite"):
     """
-    Warn when using wrapped func
+    Warn when using wrapped func, once per call site or once per process
+    depending on scope. Calls are counted by call site, see
+    deprecation_usage(). When the FTOOLS_DISABLE_DEPRECATED environment
+    variable is set func is returned as is.
     """
+    if scope not in DEPRECATION_SCOPES:
+        raise ValueError(f"Scope must be one of {DEPRECATION_SCOPES}, received {scope}")
+    if func is None:
+        return partial(deprecated, scope=scope)
+    if os.environ.get(DISABLE_DEPRECATED_ENV, "") not in ("", "0"):
+        return func
+
     func_name = fullname(func)
+    message = f"{func_name} is deprecated"
+    lock = Lock()
+    usage: Dict[Tuple[int, int], list] = {}
+    with _deprecation_lock:
+        _deprecation_usage.setdefault(func_name, []).append((lock, usage))
+    per_call_site = scope == "callsite"
+    process_calls = 0
 
     @wraps(func)
     def decorated(*args, **kwargs):
-        warnings.warn(f"{func_name} is deprecated", DeprecationWarning)
+        nonlocal process_calls
+        caller = sys._getframe(1)  # pylint: disable=protected-access
+        # f_lineno and hashing code are costly: the line is computed when
+        # reporting, and the site keeps the code alive so its id is not reused
+        call_site = (id(caller.f_code), caller.f_lasti)
+        with lock:
+            site = usage.get(call_site)
+            if site is None:
+                site = usage[call_site] = [caller.f_code, 0]
+            site[1] += 1
+            process_calls += 1
+            first = (site[1] if per_call_site else process_calls) == 1
+        if first:
+            import warnings  # pylint: disable=import-outside-toplevel
+
+            warnings.warn(message, DeprecationWarning, stacklevel=2)
         return func(*args, **kwargs)
 
-    return decorated  # type: ignore
+    return _named_after(decorated, func)  # type: ignore
 
 
-def curry(_callable: Callable):
+def deprecation_usage() -> Dict[str, Dict[str, int]]:
     """
-    Creates a function that accepts arguments of func and either invokes func returning its result,
-    if at least arity number of arguments have been provided, or returns a function that accepts
-    the remaining func arguments, and so on.
+    The number of calls to deprecated() functions, by the full name of the
+    function and the "filename:line" of the call site
     """
-
-    _signature = signature(_callable)
-    required_params = set()
+    with _deprecation_lock:
+        functions = list(_deprecation_usage.items())
+    report: Dict[str, Dict[str, int]] = {}
+    for name, usages in functions:
+        call_sites: Counter = Counter()
+        for lock, usage in usages:
+            with lock:
+                counts = [(offset, *site) for (_, offset), site in usage.items()]
+            for offset, code, calls in counts:
+                call_sites[f"{code.co_filename}:{_line_of(code, offset)}"] += calls
+        report[name] = dict(call_sites)
+    return report
+
+
+def _line_of(code: CodeType, offset: int) -> int:
+    from dis import findlinestarts  # pylint: disable=import-outside-toplevel
+
+    line = code.co_firstlineno
+    for start, start_line in findlinestarts(code):
+        if start > offset:
+            break
+        if start_line is not None:
+            line = start_line
+    return line
+
+
+def _parameter_tables(
+    _signature: Signature,
+) -> Tuple[Tuple[str, ...], int, FrozenSet[str]]:
+    """
+    Computes the parameter tables curry() dispatches on: the names of the
+    positional parameters, the number of required positional parameters and the
+    names of the required keyword only parameters.
+    """
+    positional = []
+    arity = 0
+    required_keywords = set()
 
     for name, parameter in _signature.parameters.items():
         if parameter.kind is Parameter.VAR_POSITIONAL:
             raise TypeError(
                 "Curry can not be applied on a function with var positional parameters (*args)"
             )
-        if (
-            parameter.kind is not Parameter.VAR_KEYWORD
+        if parameter.kind in {
+            Parameter.POSITIONAL_ONLY,
+            Parameter.POSITIONAL_OR_KEYWORD,
+        }:
+            positional.append(name)
+            if parameter.default is Parameter.empty:
+                arity += 1
+        elif (
+            parameter.kind is Parameter.KEYWORD_ONLY
             and parameter.default is Parameter.empty
         ):
-            required_params.add(name)
+            required_keywords.add(name)
+
+    return tuple(positional), arity, frozenset(required_keywords)
+
+
+def _apply_curried(func: Callable, args: tuple, keywords: dict):
+    return func(*args, **keywords)
+
+
+class CurriedPartial:
+    """
+    The partial application of a curried function. Accumulated arguments are
+    kept flat in args and keywords, like functools.partial, together with the
+    number of positional arguments that are still missing so the completing
+    call is dispatched without inspecting the signature again.
+    """
+
+    __slots__ = ("func", "args", "keywords", "_complete", "_missing")
+
+    def __init__(
+        self,
+        func: Callable,
+        _callable: Callable,
+        args: tuple,
+        keywords: dict,
+        missing: Optional[int],
+    ) -> None:
+        self.func = func
+        self.args = args
+        self.keywords = keywords
+        # functools.partial merges arguments in C, cheaper than unpacking them here
+        self._complete = partial(_callable, *args, **keywords)
+        self._missing = missing
+
+    def __call__(self, *args, **kwargs):
+        if not kwargs and self._missing is not None and len(args) >= self._missing:
+            return self._complete(*args)
+        return self.func(*self.args, *args, **{**self.keywords, **kwargs})
+
+    @property
+    def __signature__(self) -> Signature:
+        return signature(self._complete)
+
+    def __reduce__(self):
+        # _complete refers to the undecorated function, which pickle can't
+        # find by name, so the partial is rebuilt through the curried one
+        return _apply_curried, (self.func, self.args, self.keywords)
+
+    def __repr__(self) -> str:
+        arguments = [repr(self.func)]
+        arguments.extend(repr(arg) for arg in self.args)
+        arguments.extend(f"{key}={value!r}" for key, value in self.keywords.items())
+        return f"{type(self).__name__}({', '.join(arguments)})"
+
+
+def curry(_callable: Callable):
+    """
+    Creates a function that accepts arguments of func and either invokes func returning its result,
+    if at least arity number of arguments have been provided, or returns a function that accepts
+    the remaining func arguments, and so on.
+    """
+
+    _signature = signature(_callable)
+    positional, arity, required_keywords = _parameter_tables(_signature)
+    required_params = set(positional[:arity]) | required_keywords
+
+    def missing_positional(args: tuple, kwargs: dict) -> Optional[int]:
+        # Only positional arguments can complete the call without binding
+        if required_keywords - kwargs.keys() or not kwargs.keys().isdisjoint(
+            positional[len(args) :]
+        ):
+            return None
+        return arity - len(args)
 
     @wraps(_callable)
     def curried(*args, **kwargs):
+        # Saturated calls skip binding: the wrapped function validates its own arguments
+        if len(args) >= arity and (
+            not required_keywords or required_keywords <= kwargs.keys()
+        ):
+            return _callable(*args, **kwargs)
         bound = _signature.bind_partial(*args, **kwargs)
-        if required_params - set(bound.arguments.keys()):
-            return partial(curried, *args, **kwargs)
+        if required_params - bound.arguments.keys():
+            return CurriedPartial(
+                curried, _callable, args, kwargs, missing_positional(args, kwargs)
+            )
         return _callable(*args, **kwargs)
 
-    return curried
+    return _named_after(curried, _callable)
 
 
 O = TypeVar("O", bound=object)  # pylint: disable=invalid-name
@@ -111,23 +319,13 @@ class currymethod:  # pylint: disable=too-few-public-methods,invalid-name
                 self_param = parameter
                 break
 
-        required_params = set()
-
-        for name, parameter in _signature.parameters.items():
-            if parameter.kind is Parameter.VAR_POSITIONAL:
-                raise TypeError(
-                    "Curry can not be applied on a function with var positional parameters (*args)"
-                )
-            if (
-                parameter.kind is not Parameter.VAR_KEYWORD
-                and parameter.default is Parameter.empty
-            ):
-                required_params.add(name)
+        positional, arity, required_keywords = _parameter_tables(_signature)
+        required_params = set(positional[:arity]) | required_keywords
 
         @wraps(method)
         def static(*args, **kwargs):
             bound = _signature.bind_partial(*args, **kwargs)
-            if required_params - set(bound.arguments.keys()):
+            if required_params - bound.arguments.keys():
                 return partial(static, *args, **kwargs)
             if self_param.name in kwargs:
                 return method(*args, **kwargs)
@@ -141,13 +339,125 @@ class currymethod:  # pylint: disable=too-few-public-methods,invalid-name
         return self.static
 
 
-@curry
-def flow(funcs: Iterable[Callable], value):
+class Flow:
+    """
+    A composition of functions, see flow(). The functions are kept in a tuple
+    taken when the flow is created, and flows of up to four functions are
+    created as subclasses with the calls unrolled.
+    """
+
+    __slots__ = ("funcs",)
+
+    def __init__(self, funcs: Tuple[Callable, ...]) -> None:
+        self.funcs = funcs
+
+    def __call__(self, value):
+        for func in self.funcs:
+            value = func(value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.funcs)!r})"
+
+
+class _Flow1(Flow):  # pylint: disable=too-few-public-methods
+    __slots__ = ("_f0",)
+
+    def __init__(self, funcs: Tuple[Callable, ...]) -> None:
+        super().__init__(funcs)
+        (self._f0,) = funcs
+
+    def __call__(self, value):
+        return self._f0(value)
+
+
+class _Flow2(Flow):  # pylint: disable=too-few-public-methods
+    __slots__ = ("_f0", "_f1")
+
+    def __init__(self, funcs: Tuple[Callable, ...]) -> None:
+        super().__init__(funcs)
+        self._f0, self._f1 = funcs
+
+    def __call__(self, value):
+        return self._f1(self._f0(value))
+
+
+class _Flow3(Flow):  # pylint: disable=too-few-public-methods
+    __slots__ = ("_f0", "_f1", "_f2")
+
+    def __init__(self, funcs: Tuple[Callable, ...]) -> None:
+        super().__init__(funcs)
+        self._f0, self._f1, self._f2 = funcs
+
+    def __call__(self, value):
+        return self._f2(self._f1(self._f0(value)))
+
+
+class _Flow4(Flow):  # pylint: disable=too-few-public-methods
+    __slots__ = ("_f0", "_f1", "_f2", "_f3")
+
+    def __init__(self, funcs: Tuple[Callable, ...]) -> None:
+        super().__init__(funcs)
+        self._f0, self._f1, self._f2, self._f3 = funcs
+
+    def __call__(self, value):
+        return self._f3(self._f2(self._f1(self._f0(value))))
+
+
+class _TimedFlow(Flow):  # pylint: disable=too-few-public-methods
+    __slots__ = ("hook",)
+
+    def __init__(
+        self, funcs: Tuple[Callable, ...], hook: Callable[[Callable, float], None]
+    ) -> None:
+        super().__init__(funcs)
+        self.hook = hook
+
+    def __call__(self, value):
+        for func in self.funcs:
+            start = perf_counter()
+            value = func(value)
+            self.hook(func, perf_counter() - start)
+        return value
+
+
+_UNROLLED_FLOWS = {1: _Flow1, 2: _Flow2, 3: _Flow3, 4: _Flow4}
+_NO_VALUE = object()
+
+
+def flow(
+    funcs: Iterable[Callable],
+    value=_NO_VALUE,
+    hook: Optional[Callable[[Callable, float], None]] = None,
+):
     """
     Creates a function that returns the result of invoking the given functions where each
-    successive invocation is supplied the return value of the previous.
+    successive invocation is supplied the return value of the previous. If value is given
+    the result of invoking the function with it is returned. If hook is given it is called
+    with every function and the seconds its invocation took.
+    """
+    snapshot = tuple(funcs)
+    for index, func in enumerate(snapshot):
+        if not callable(func):
+            raise TypeError(f"Function {index} of flow is not callable: {func!r}")
+    if hook is not None:
+        composed: Flow = _TimedFlow(snapshot, hook)
+    else:
+        composed = _UNROLLED_FLOWS.get(len(snapshot), Flow)(snapshot)
+    if value is _NO_VALUE:
+        return composed
+    return composed(value)
+
+
+def compose(
+    funcs: Iterable[Callable],
+    value=_NO_VALUE,
+    hook: Optional[Callable[[Callable, float], None]] = None,
+):
     """
-    return reduce(lambda acc, func: func(acc), funcs, value)
+    Like flow() but invokes the given functions from right to left.
+    """
+    return flow(tuple(funcs)[::-1], value, hook)
 
 
 def noop(*_, **__) -> None:
@@ -171,82 +481,505 @@ def constant(value: Value) -> Callable[..., Value]:
     return constant_func
 
 
-def graceful(func: T, exception_type: Type[Exception] = Exception) -> T:
+_graceful_counters: Dict[str, Counter] = {}
+_graceful_lock = Lock()
+
+
+def graceful(  # pylint: disable=too-many-arguments
+    func: T,
+    exception_type: Type[Exception] = Exception,
+    *,
+    default=None,
+    fallback: Optional[Callable] = None,
+    sample_rate: float = 1.0,
+    log_interval: Union[float, int] = 0,
+) -> T:
     """
-    Creates a functions that returns the result of invoking the given function or None if
-    it raised an exception.
+    Creates a functions that returns the result of invoking the given function or
+    default if it raised an exception. If given, the result of fallback invoked
+    with the same arguments is returned instead of default. Swallowed exceptions
+    are counted per function and exception type, see graceful_stats(), and
+    logged lazily: only a sample_rate fraction of them and at most one every
+    log_interval milliseconds.
     """
+    name = fullname(func)
+    with _graceful_lock:
+        counter = _graceful_counters.setdefault(name, Counter())
+    interval = log_interval / 1000
+    last_logged = -inf
 
     @wraps(func)
     def wrapped(*args, **kwargs):
+        nonlocal last_logged
         try:
             return func(*args, **kwargs)
         except exception_type as exception:  # pylint: disable=broad-except
-            getLogger().error(
-                f"An exception has been raised while executing {func.__name__}: "
-                + repr(exception)
-            )
-            return None
+            with _graceful_lock:
+                counter[type(exception).__name__] += 1
+                now = monotonic()
+                should_log = now - last_logged >= interval
+                if should_log and sample_rate < 1:
+                    from random import random  # pylint: disable=import-outside-toplevel
+
+                    should_log = random() < sample_rate
+                if should_log:
+                    last_logged = now
+            if should_log:
+                from logging import getLogger  # pylint: disable=import-outside-toplevel
+
+                getLogger().error(
+                    "An exception has been raised while executing %s: %r",
+                    func.__name__,
+                    exception,
+                )
+            if fallback is not None:
+                return fallback(*args, **kwargs)
+            return default
+
+    return _named_after(wrapped, func)  # type: ignore
+
+
+def graceful_stats() -> Dict[str, Dict[str, int]]:
+    """
+    The number of exceptions swallowed by graceful() functions, by the full
+    name of the function and the name of the exception type
+    """
+    with _graceful_lock:
+        return {name: dict(counter) for name, counter in _graceful_counters.items()}
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def _freeze(value):
+    """
+    Converts value to a hashable value, replacing mappings, lists and sets
+    with frozen counterparts recursively so equal values convert to equal
+    keys
+    """
+    if isinstance(value, Mapping):
+        return (
+            Mapping,
+            frozenset((key, _freeze(item)) for key, item in value.items()),
+        )
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (AbstractSet, frozenset(_freeze(item) for item in value))
+    return value
+
+
+_SCALARS = frozenset((int, float, str, bytes, bool, type(None)))
+_MISSING = object()
+
+
+def default_key(*args, **kwargs) -> Hashable:
+    """
+    The cache key of memoize(): the frozen arguments
+    """
+    if not kwargs and all(type(arg) in _SCALARS for arg in args):
+        return args
+    return _freeze(args), _freeze(kwargs)
+
+
+class Memoized:
+    """
+    A memoized function, see memoize(). Memoized methods share the cache
+    of the function, with the instance as part of the key.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        func: Callable,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[Union[float, int]] = None,
+        key: Callable[..., Hashable] = default_key,
+    ) -> None:
+        update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.ttl = None if ttl is None else ttl / 1000
+        self.key = key
+        self._cache: "OrderedDict[Hashable, Tuple[object, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._lock = RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(self, *args, **kwargs):
+        cache_key = self.key(*args, **kwargs)
+        with self._lock:
+            entry = self._cache.get(cache_key, _MISSING)
+            if entry is not _MISSING:
+                value, expires = entry  # type: ignore
+                if expires is None or expires > monotonic():
+                    self._cache.move_to_end(cache_key)
+                    self._hits += 1
+                    return value
+                del self._cache[cache_key]
+            self._misses += 1
+        # Computed outside the lock so slow calls don't block hits
+        value = self.func(*args, **kwargs)
+        if self.maxsize == 0:
+            return value
+        expires = None if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            self._cache[cache_key] = (value, expires)
+            self._cache.move_to_end(cache_key)
+            if self.maxsize is not None and len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return value
 
-    return wrapped  # type: ignore
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return partial(self, instance)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Reports the hits, misses, maximum size and current size of the cache
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self) -> None:
+        """
+        Clears the cache and its statistics
+        """
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.func!r})"
+
+
+def memoize(
+    func: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = 128,
+    ttl: Optional[Union[float, int]] = None,
+    key: Callable[..., Hashable] = default_key,
+):
+    """
+    Creates a function that caches the results of func by the key computed
+    from its arguments. By default arguments are frozen so unhashable
+    mappings, lists and sets can be used. The least recently used results are
+    evicted beyond maxsize results (None for unbounded) and results expire
+    after ttl milliseconds if given. The memoized function comes with
+    cache_info and cache_clear methods. Use as @memoize or
+    @memoize(maxsize=..., ttl=..., key=...).
+    """
+    if func is None:
+        return partial(memoize, maxsize=maxsize, ttl=ttl, key=key)
+    return Memoized(func, maxsize, ttl, key)
 
 
-def once(_callable: T) -> T:
+def once(_callable: T, cache_exceptions: bool = False) -> T:
     """
     Creates a callable that is restricted to be called once. Repeat calls to the
-    callable return the value of the first call.
+    callable return the value of the first call. Concurrent first calls are
+    serialised so the callable runs once, and for coroutine functions the first
+    call's task is shared by all callers. An exception raised by the callable is
+    raised again by repeat calls if cache_exceptions is set, otherwise the next
+    call retries. The created callable comes with a reset method that forgets
+    the first call.
     """
+    if iscoroutinefunction(_callable):
+        return _once_async(_callable, cache_exceptions)
+
+    lock = RLock()
     result = None
+    exception: Optional[BaseException] = None
     called = False
 
     @wraps(_callable)
     def decorated(*args, **kwargs):
         nonlocal result
+        nonlocal exception
         nonlocal called
-        if called:
-            return result
-        result = _callable(*args, **kwargs)
-        called = True
+        if not called:
+            with lock:
+                if not called:
+                    try:
+                        result = _callable(*args, **kwargs)
+                    except Exception as error:
+                        if cache_exceptions:
+                            exception = error
+                            called = True
+                        raise
+                    called = True
+        if exception is not None:
+            raise exception
         return result
 
+    def reset() -> None:
+        nonlocal result
+        nonlocal exception
+        nonlocal called
+        with lock:
+            result = None
+            exception = None
+            called = False
+
+    _named_after(decorated, _callable)
+    decorated.reset = reset  # type: ignore
+    decorated = cast(T, decorated)
+
+    return decorated
+
+
+def _once_async(_callable: T, cache_exceptions: bool) -> T:
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    task: Optional[asyncio.Future] = None
+
+    @wraps(_callable)
+    async def decorated(*args, **kwargs):
+        nonlocal task
+        if task is None:
+            task = asyncio.ensure_future(_callable(*args, **kwargs))
+        current = task
+        if current.done() and not current.cancelled() and current.exception() is None:
+            return current.result()
+        try:
+            # Cancelling one caller must not cancel the task the others await
+            return await asyncio.shield(current)
+        except BaseException:
+            failed = current.done() and (
+                current.cancelled() or current.exception() is not None
+            )
+            if failed and not cache_exceptions and task is current:
+                task = None
+            raise
+
+    def reset() -> None:
+        nonlocal task
+        task = None
+
+    _named_after(decorated, _callable)
+    decorated.reset = reset  # type: ignore
     decorated = cast(T, decorated)
 
     return decorated
 
 
+class Debounced:
+    """
+    A debounced function, see debounce(). Delayed invocations run on a timer
+    thread, or on loop when one is given, and all state is guarded by a lock so
+    the debounced function can be called from any thread. The lock is released
+    before func is invoked.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        func: Callable,
+        wait: Union[float, int],
+        *,
+        leading: bool = False,
+        trailing: bool = True,
+        max_wait: Optional[Union[float, int]] = None,
+        loop: Optional["asyncio.AbstractEventLoop"] = None,
+    ) -> None:
+        update_wrapper(self, func)
+        self.func = func
+        self.wait = wait / 1000
+        self.leading = leading
+        self.trailing = trailing
+        self.max_wait = None if max_wait is None else max(max_wait, wait) / 1000
+        self.loop = loop
+        self._lock = Lock()
+        self._timer: Optional[Union[Timer, "asyncio.TimerHandle"]] = None
+        self._last_args: Optional[Tuple[tuple, dict]] = None
+        self._last_call_time: Optional[float] = None
+        self._last_invoke_time = 0.0
+        self._result = None
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            now = monotonic()
+            is_invoking = self._should_invoke(now)
+            self._last_args = (args, kwargs)
+            self._last_call_time = now
+            invocation = None
+            if is_invoking and self._timer is None:
+                invocation = self._leading_edge(now)
+            elif is_invoking and self.max_wait is not None:
+                # Calls kept coming for max_wait, invoke without waiting
+                self._start_timer(self.wait)
+                invocation = self._take_arguments(now)
+            elif self._timer is None:
+                self._start_timer(self.wait)
+            if invocation is None:
+                return self._result
+        return self._invoke(invocation)
+
+    def cancel(self) -> None:
+        """
+        Cancels the delayed invocation, if any
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._last_args = None
+            self._last_call_time = None
+            self._last_invoke_time = 0.0
+
+    def flush(self):
+        """
+        Immediately invokes the delayed invocation, if any, and returns the
+        result of the last invocation
+        """
+        with self._lock:
+            if self._timer is None:
+                return self._result
+            self._timer.cancel()
+            invocation = self._trailing_edge()
+            if invocation is None:
+                return self._result
+        return self._invoke(invocation)
+
+    def pending(self) -> bool:
+        """
+        Whether an invocation is delayed
+        """
+        with self._lock:
+            return self._timer is not None
+
+    def _should_invoke(self, now: float) -> bool:
+        if self._last_call_time is None:
+            return True
+        since_last_call = now - self._last_call_time
+        return (
+            since_last_call >= self.wait
+            or since_last_call < 0
+            or (
+                self.max_wait is not None
+                and now - self._last_invoke_time >= self.max_wait
+            )
+        )
+
+    def _remaining_wait(self, now: float) -> float:
+        remaining = self.wait - (now - cast(float, self._last_call_time))
+        if self.max_wait is None:
+            return remaining
+        return min(remaining, self.max_wait - (now - self._last_invoke_time))
+
+    def _start_timer(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        if self.loop is not None:
+            self._timer = self.loop.call_later(delay, self._timer_expired)
+            return
+        timer = Timer(delay, self._timer_expired)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def _timer_expired(self) -> None:
+        with self._lock:
+            if self._timer is None:
+                return
+            now = monotonic()
+            if not self._should_invoke(now):
+                self._start_timer(self._remaining_wait(now))
+                return
+            invocation = self._trailing_edge()
+        if invocation is not None:
+            self._invoke(invocation)
+
+    # The edges return the arguments of the invocation they decide on, which
+    # is run by _invoke once the lock is released
+
+    def _leading_edge(self, now: float) -> Optional[Tuple[tuple, dict]]:
+        self._last_invoke_time = now
+        self._start_timer(self.wait)
+        if self.leading:
+            return self._take_arguments(now)
+        return None
+
+    def _trailing_edge(self) -> Optional[Tuple[tuple, dict]]:
+        self._timer = None
+        if self.trailing and self._last_args is not None:
+            return self._take_arguments(monotonic())
+        self._last_args = None
+        return None
+
+    def _take_arguments(self, now: float) -> Tuple[tuple, dict]:
+        invocation = cast(Tuple[tuple, dict], self._last_args)
+        self._last_args = None
+        self._last_invoke_time = now
+        return invocation
+
+    def _invoke(self, invocation: Tuple[tuple, dict]):
+        args, kwargs = invocation
+        result = self.func(*args, **kwargs)
+        if self.loop is not None and isawaitable(result):
+            import asyncio  # pylint: disable=import-outside-toplevel
+
+            result = asyncio.ensure_future(result, loop=self.loop)
+        with self._lock:
+            self._result = result
+        return result
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.func!r}, wait={self.wait * 1000:g})"
+
+
 @curry
-def debounce(
-    wait: Union[float, int], func: T, leading: bool = False, trailing: bool = True
-) -> T:
+def debounce(  # pylint: disable=too-many-arguments
+    wait: Union[float, int],
+    func: Callable,
+    *,
+    leading: bool = False,
+    trailing: bool = True,
+    max_wait: Optional[Union[float, int]] = None,
+    loop: Optional["asyncio.AbstractEventLoop"] = None,
+) -> Debounced:
     """
     Creates a debounced function that delays invoking func until after wait
     milliseconds have elapsed since the last time the debounced function was
     invoked. The debounced function comes with a cancel method to cancel delayed
-    func invocations and a flush method to immediately invoke them. Provide
-    options to indicate whether func should be invoked on the leading and/or
-    trailing edge of the wait timeout. The func is invoked with the last
-    arguments provided to the debounced function. Subsequent calls to the
-    debounced function return the result of the last func invocation.
+    func invocations, a flush method to immediately invoke them and a pending
+    method to check for them. Provide options to indicate whether func should be
+    invoked on the leading and/or trailing edge of the wait timeout, and the
+    maximum milliseconds func is allowed to be delayed. The func is invoked with
+    the last arguments provided to the debounced function. Subsequent calls to
+    the debounced function return the result of the last func invocation.
+    Delayed invocations run on a timer thread, or on given asyncio loop, in which
+    case the debounced function must be called from the loop's thread.
     """
-    invoked = None
-    value = None
+    return Debounced(
+        func, wait, leading=leading, trailing=trailing, max_wait=max_wait, loop=loop
+    )
 
-    def decorated(*args, **kwargs):
-        nonlocal value
-        nonlocal invoked
-        if invoked is None:
-            invoked = time()
-            if leading:
-                value = func(*args, **kwargs)
-        if (time() - invoked) * 1000 >= wait:
-            invoked = None
-            if trailing:
-                value = func(*args, **kwargs)
-        return value
-
-    decorated = cast(T, decorated)
 
-    return decorated
+@curry
+def throttle(
+    wait: Union[float, int],
+    func: Callable,
+    *,
+    leading: bool = True,
+    trailing: bool = True,
+    loop: Optional["asyncio.AbstractEventLoop"] = None,
+) -> Debounced:
+    """
+    Creates a throttled function that only invokes func at most once per every
+    wait milliseconds. Like debounce() the throttled function comes with cancel,
+    flush and pending methods and options to invoke func on the leading and/or
+    trailing edge of the wait timeout.
+    """
+    return Debounced(
+        func, wait, leading=leading, trailing=trailing, max_wait=wait, loop=loop
+    )
 
 
 Item = TypeVar("Item")  # pylint: disable=invalid-name
@@ -19,12 +19,17 @@ from typing import (
     Tuple,
     Hashable,
     Sequence,
+    Optional,
 )
-from cardinality import count
 from .callable import curry
-from .iterable import head
+from .persistent import (
+    PersistentMap,
+    PersistentMapEvolver,
+    PersistentVector,
+    PersistentVectorEvolver,
+)
 from .sequence import pick as sequence_pick
-from .mapping import pick as mapping_pick
+from .mapping import items as mapping_items, pick as mapping_pick
 
 # This is actually Mapping x Iterable / str
 Item = Union[Hashable, int]
@@ -83,6 +88,153 @@ def hasitem(path: RawPath, collection: Collection) -> bool:
     return True
 
 
+_LOOKUP_ERRORS = (KeyError, TypeError, IndexError)
+
+
+def _compile_getter(path: Tuple[Item, ...]) -> Callable[[Collection], V]:
+    # pylint: disable=unbalanced-tuple-unpacking
+    if len(path) == 1:
+        (key,) = path
+
+        def getter(collection):
+            try:
+                return collection[key]
+            except _LOOKUP_ERRORS:
+                return None
+
+    elif len(path) == 2:
+        first, second = path
+
+        def getter(collection):
+            try:
+                return collection[first][second]
+            except _LOOKUP_ERRORS:
+                return None
+
+    elif len(path) == 3:
+        first, second, third = path
+
+        def getter(collection):
+            try:
+                return collection[first][second][third]
+            except _LOOKUP_ERRORS:
+                return None
+
+    elif len(path) == 4:
+        first, second, third, fourth = path
+
+        def getter(collection):
+            try:
+                return collection[first][second][third][fourth]
+            except _LOOKUP_ERRORS:
+                return None
+
+    else:
+
+        def getter(collection):
+            value = collection
+            try:
+                for key in path:
+                    value = value[key]
+            except _LOOKUP_ERRORS:
+                return None
+            return value
+
+    return getter
+
+
+def _compile_hasser(path: Tuple[Item, ...]) -> Callable[[Collection], bool]:
+    # pylint: disable=unbalanced-tuple-unpacking,pointless-statement
+    if len(path) == 1:
+        (key,) = path
+
+        def hasser(collection):
+            try:
+                collection[key]
+            except _LOOKUP_ERRORS:
+                return False
+            return True
+
+    elif len(path) == 2:
+        first, second = path
+
+        def hasser(collection):
+            try:
+                collection[first][second]
+            except _LOOKUP_ERRORS:
+                return False
+            return True
+
+    elif len(path) == 3:
+        first, second, third = path
+
+        def hasser(collection):
+            try:
+                collection[first][second][third]
+            except _LOOKUP_ERRORS:
+                return False
+            return True
+
+    elif len(path) == 4:
+        first, second, third, fourth = path
+
+        def hasser(collection):
+            try:
+                collection[first][second][third][fourth]
+            except _LOOKUP_ERRORS:
+                return False
+            return True
+
+    else:
+
+        def hasser(collection):
+            value = collection
+            try:
+                for key in path:
+                    value = value[key]
+            except _LOOKUP_ERRORS:
+                return False
+            return True
+
+    return hasser
+
+
+class CompiledPath:
+    """
+    The object returned by compile_path(). Calling it is like getitem(path).
+    For the hottest loops pass its get or has attributes, plain functions, to
+    map(), key_by() or group_by() directly.
+    """
+
+    __slots__ = ("path", "get", "has")
+
+    def __init__(self, path: RawPath) -> None:
+        self.path = tuple(to_path(path))
+        self.get = _compile_getter(self.path)
+        self.has = _compile_hasser(self.path)
+
+    def __call__(self, collection: Collection) -> V:
+        return self.get(collection)
+
+    def set(self, value: V, collection: MutableCollection) -> MutableCollection:
+        """
+        Like setitem() for the compiled path
+        """
+        return _setitems(((self.path, value),), collection)
+
+    def __repr__(self) -> str:
+        return f"compile_path({self.path!r})"
+
+
+def compile_path(path: RawPath) -> CompiledPath:
+    """
+    Normalises path once and returns an object with specialised get(), has()
+    and set() functions for it, like getitem(), hasitem() and setitem() but
+    without converting or looping over the path on every call.
+    """
+    return CompiledPath(path)
+
+
 def _safe_setitem(item, value, collection):
     try:
         collection[item] = value
@@ -92,6 +244,93 @@ def _safe_setitem(item, value, collection):
         collection[item] = value
 
 
+class _PathCopier:
+    """
+    Copies the collections along paths for a single immutable update. Every
+    collection is copied once per update: copies are owned (by id) and reused
+    by later paths. Persistent collections are "copied" into evolvers which are
+    turned back into persistent collections by seal().
+    """
+
+    __slots__ = ("owned", "evolvers")
+
+    def __init__(self) -> None:
+        self.owned: dict = {}
+        self.evolvers: list = []
+
+    def copy(self, collection, parent=None, key=None):
+        """
+        Returns an owned mutable copy of collection, found at key of parent
+        """
+        if isinstance(collection, (PersistentMap, PersistentVector)):
+            clone = collection.evolver()
+            self.evolvers.append((parent, key, clone))
+        else:
+            clone = copy(collection)
+        self.owned[id(clone)] = clone
+        return clone
+
+    def parent(self, path: Path, clone: MutableCollection, create: bool):
+        """
+        Walks all but the last key of path from clone, an owned copy, and
+        returns the owned parent collection of the last key. If create is true
+        missing collections are created, otherwise the lookup error is raised.
+        """
+        for index in range(len(path) - 1):
+            key = path[index]
+            try:
+                sub = clone[key]
+            except (KeyError, IndexError):
+                if not create:
+                    raise
+                if isinstance(clone, (PersistentMapEvolver, PersistentVectorEvolver)):
+                    empty = (
+                        PersistentVector()
+                        if isinstance(path[index + 1], int)
+                        else PersistentMap()
+                    )
+                    sub = self.copy(empty, clone, key)
+                else:
+                    sub = [] if isinstance(path[index + 1], int) else {}
+                    self.owned[id(sub)] = sub
+                _safe_setitem(key, sub, clone)
+            else:
+                if id(sub) not in self.owned:
+                    sub = self.copy(sub, clone, key)
+                    clone[key] = sub
+            clone = sub
+        return clone
+
+    def seal(self, clone: MutableCollection) -> MutableCollection:
+        """
+        Replaces the evolvers made by copy() with their persistent collections,
+        innermost first, and returns the sealed clone
+        """
+        for parent, key, evolver in reversed(self.evolvers):
+            if parent is None:
+                clone = evolver.persistent()
+                continue
+            try:
+                if parent[key] is not evolver:
+                    continue
+            except (KeyError, IndexError):
+                continue
+            parent[key] = evolver.persistent()
+        return clone
+
+
+def _setitems(
+    updates: IterableT[Tuple[RawPath, V]], collection: MutableCollection
+) -> MutableCollection:
+    copier = _PathCopier()
+    clone = copier.copy(collection)
+    for path, value in updates:
+        path = to_path(path)
+        parent = copier.parent(path, clone, True)
+        _safe_setitem(path[-1], value, parent)
+    return copier.seal(clone)
+
+
 @curry
 def setitem(
     path: RawPath, value: V, collection: MutableCollection
@@ -99,29 +338,19 @@ def setitem(
     """
     Sets the value at path of collection. If a portion of path doesn't exist, it's created.
     """
-    path = to_path(path)
-    clone = copy(collection)
-    key = head(path)
-    if count(path) == 1:
-        _safe_setitem(key, value, clone)
-    else:
-        try:
-            sub = collection[key]
-        except KeyError:
-            if isinstance(path[1], int):
-                sub = []
-            else:
-                sub = {}
-        except IndexError:
-            for i in range(len(clone), key + 1):
-                clone.insert(i, None)
-            if isinstance(path[1], int):
-                sub = []
-            else:
-                sub = {}
-        clone[key] = setitem(path[1:], value, sub)
+    return _setitems(((path, value),), collection)
 
-    return clone
+
+@curry
+def setitems(
+    updates: Mapping[RawPath, V], collection: MutableCollection
+) -> MutableCollection:
+    """
+    Like setitem() but sets the value of every path in updates, in order. Every
+    collection on the paths is copied once, so paths sharing a prefix share the
+    copies of it.
+    """
+    return _setitems(updates.items(), collection)
 
 
 @curry
@@ -130,13 +359,11 @@ def delitem(path: RawPath, collection: MutableCollection) -> MutableCollection:
     Deletes given path from collection
     """
     path = to_path(path)
-    clone = copy(collection)
-    key = head(path)
-    if count(path) == 1:
-        del clone[key]
-    else:
-        clone[key] = delitem(path[1:], collection[key])
-    return clone
+    copier = _PathCopier()
+    clone = copier.copy(collection)
+    parent = copier.parent(path, clone, False)
+    del parent[path[-1]]
+    return copier.seal(clone)
 
 
 @curry
@@ -146,42 +373,148 @@ def update(
     """
     This method is like set except that accepts updater to produce the value to set.
     """
-    value = getitem(path, collection)
-    return setitem(path, modifier(value), collection)
+    path = to_path(path)
+    copier = _PathCopier()
+    clone = copier.copy(collection)
+    parent = copier.parent(path, clone, True)
+    key = path[-1]
+    try:
+        value = parent[key]
+    except (KeyError, TypeError, IndexError):
+        value = None
+    _safe_setitem(key, modifier(value), parent)
+    return copier.seal(clone)
 
 
-def branches(
-    collection: Collection,
-) -> Generator[Tuple[Path, Union[Collection, V]], None, None]:
+class LinkedPath(Sequence[Item]):
     """
-    Iterates each path and value pair of the collection and it's descendent collections
+    A path made of a key and the path of its parent collection, so extending a
+    path is O(1) and sibling paths share their prefix. The keys are collected
+    when the path is iterated, indexed or compared.
     """
-    from .mapping import items  # pylint: disable=import-outside-toplevel
 
+    __slots__ = ("parent", "key", "_length")
+
+    def __init__(self, parent: Optional["LinkedPath"], key: Item) -> None:
+        self.parent = parent
+        self.key = key
+        self._length = 1 if parent is None else parent._length + 1
+
+    def to_tuple(self) -> Tuple[Item, ...]:
+        """
+        Returns the keys of the path as a tuple
+        """
+        keys = []
+        node: Optional[LinkedPath] = self
+        while node is not None:
+            keys.append(node.key)
+            node = node.parent
+        keys.reverse()
+        return tuple(keys)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        return self.to_tuple()[index]
+
+    def __iter__(self):
+        return iter(self.to_tuple())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LinkedPath):
+            return self.to_tuple() == other.to_tuple()
+        if isinstance(other, tuple):
+            return self.to_tuple() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.to_tuple())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self.to_tuple()!r}"
+
+
+_PATH_TYPES = {
+    tuple: ((), None),
+    list: ([], lambda prefix, key: prefix + [key]),
+    LinkedPath: (None, LinkedPath),
+}
+
+
+def _children(collection: Collection):
+    if isinstance(collection, dict):
+        return iter(collection.items())
     if isinstance(collection, abc.Mapping):
-        iterator = items(collection)
-    elif isinstance(collection, abc.Iterable):
-        iterator = enumerate(collection)
+        return iter(mapping_items(collection))
+    return enumerate(collection)
+
 
-    for key, value in iterator:
-        yield (key,), value
-        if isinstance(value, (abc.Mapping, abc.Iterable)) and not isinstance(
-            value, str
-        ):
-            for path, subvalue in branches(value):
-                yield (key,) + path, subvalue
+def _walk(collection, max_depth, prune, path_type, only_leaves):
+    """
+    Iterates the branches of collection depth first with a stack of child
+    iterators, one per level, instead of recursing. Nothing is at depth 0.
+    """
+    try:
+        root, extend = _PATH_TYPES[path_type]
+    except KeyError:
+        raise TypeError(f"Unsupported path type {path_type!r}") from None
+    if max_depth is not None and max_depth < 1:
+        return _walk_stack([], max_depth, prune, extend, only_leaves)
+    stack = [(root, _children(collection))]
+    return _walk_stack(stack, max_depth, prune, extend, only_leaves)
+
+
+def _walk_stack(stack, max_depth, prune, extend, only_leaves):
+    while stack:
+        prefix, children = stack[-1]
+        for key, value in children:
+            path = prefix + (key,) if extend is None else extend(prefix, key)
+            if not isinstance(value, abc.Iterable) or isinstance(value, str):
+                yield path, value
+                continue
+            if not only_leaves:
+                yield path, value
+            if (max_depth is None or len(stack) < max_depth) and (
+                prune is None or not prune(path, value)
+            ):
+                stack.append((path, _children(value)))
+                break
+        else:
+            stack.pop()
+
+
+def branches(
+    collection: Collection,
+    max_depth: Optional[int] = None,
+    prune: Optional[Callable[[Path, Collection], bool]] = None,
+    path_type: type = tuple,
+) -> Generator[Tuple[Path, Union[Collection, V]], None, None]:
+    """
+    Iterates each path and value pair of the collection and it's descendent collections.
+    Descendents deeper than max_depth are not visited, nor are the descendents
+    of collections for which prune(path, value) returns truthy. Paths are
+    tuples, lists or, for path_type=LinkedPath, LinkedPath objects that share
+    their prefix with the path of their parent.
+    """
+    return _walk(collection, max_depth, prune, path_type, False)
 
 
-def leaves(collection: Collection) -> Generator[Tuple[Path, V], None, None]:
+def leaves(
+    collection: Collection,
+    max_depth: Optional[int] = None,
+    prune: Optional[Callable[[Path, Collection], bool]] = None,
+    path_type: type = tuple,
+) -> Generator[Tuple[Path, V], None, None]:
     """
     Like branches() but only yields non collection values
     """
-    for keys, value in branches(collection):
-        if not isinstance(value, (abc.Mapping, abc.Iterable)) or isinstance(value, str):
-            yield keys, value
+    return _walk(collection, max_depth, prune, path_type, True)
 
 
 def _pick(path_tree, collection):
+    if isinstance(collection, (PersistentMap, PersistentVector)):
+        return _pick(path_tree, collection.evolver()).persistent()
     items = path_tree.keys()
     if isinstance(collection, abc.Sequence):
         next_collection = sequence_pick(items, collection)
@@ -217,3 +550,72 @@ def pick(paths: IterableT[RawPath], collection: Collection) -> Collection:
     """
     path_tree = _create_path_tree(paths)
     return _pick(path_tree, collection)
+
+
+def _create_column_tree(paths: IterableT[Path]):
+    """
+    Like _create_path_tree() but every node lists the indices of the paths
+    ending at it and of all paths below it. Returns the root node as a tuple
+    of (ending, below, children) where children is a tuple of (key, ending,
+    below, children) tuples.
+    """
+    root: dict = {"ending": [], "children": {}}
+    for index, path in enumerate(paths):
+        cursor = root
+        for item in path:
+            cursor = cursor["children"].setdefault(item, {"ending": [], "children": {}})
+        cursor["ending"].append(index)
+
+    def freeze(node):
+        children = tuple(
+            (key,) + freeze(child) for key, child in node["children"].items()
+        )
+        below = tuple(node["ending"]) + tuple(
+            index for child in children for index in child[2]
+        )
+        return tuple(node["ending"]), below, children
+
+    return freeze(root)
+
+
+def _fill_columns(children, value, columns) -> None:
+    for key, ending, below, grandchildren in children:
+        try:
+            sub = value[key]
+        except _LOOKUP_ERRORS:
+            for index in below:
+                columns[index].append(None)
+            continue
+        for index in ending:
+            columns[index].append(sub)
+        if grandchildren:
+            _fill_columns(grandchildren, sub, columns)
+
+
+@curry
+def getitem_many(
+    paths: IterableT[RawPath], records: IterableT[Collection], *, as_arrays=False
+) -> list:
+    """
+    Gets the value at each of paths of every record and returns them as
+    columns: a list per path, in the order of paths, with a value per record.
+    Missing values are None. Paths sharing a prefix share its traversal so each
+    record is walked once. With as_arrays the columns are NumPy arrays. Paths
+    can't be an iterator, it would be exhausted by the first call of a partial.
+    """
+    if iter(paths) is paths:
+        raise TypeError(f"Paths must not be an iterator, received {paths!r}")
+    paths = [to_path(path) for path in paths]
+    ending, _, children = _create_column_tree(paths)
+    columns: list = [[] for _ in paths]
+    for record in records:
+        for index in ending:
+            columns[index].append(record)
+        _fill_columns(children, record, columns)
+    if as_arrays:
+        try:
+            import numpy  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError("getitem_many(as_arrays=True) requires NumPy") from error
+        return [numpy.array(column) for column in columns]
+    return columns
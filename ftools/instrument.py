@@ -0,0 +1,198 @@
+"""
+Opt-in instrumentation of the public functions of ftools. enable() replaces
+the functions of the instrumented modules with wrappers recording call
+counts, cumulative time and input sizes, and disable() restores the original
+functions, so there is no overhead while instrumentation is disabled. Only
+calls through the module attributes are recorded: names imported with
+"from ftools.<module> import <name>" before enable() keep the originals.
+Decorators and factories of functions, listed in NOT_INSTRUMENTED, are not
+instrumented.
+"""
+
+from functools import wraps
+from importlib import import_module
+from inspect import isfunction
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .callable import CurriedPartial, _named_after
+
+MODULES = ("callable", "collection", "iterable", "mapping", "sequence", "optional")
+
+# Mostly called while defining functions, and their results would be wrapped
+NOT_INSTRUMENTED = frozenset(
+    (
+        "ftools.callable.compose",
+        "ftools.callable.constant",
+        "ftools.callable.curry",
+        "ftools.callable.debounce",
+        "ftools.callable.deprecated",
+        "ftools.callable.flow",
+        "ftools.callable.graceful",
+        "ftools.callable.memoize",
+        "ftools.callable.once",
+        "ftools.callable.rename",
+        "ftools.callable.star",
+        "ftools.callable.throttle",
+        "ftools.mapping.extract",
+        "ftools.optional.ignore_optional",
+    )
+)
+
+
+class FunctionStats:
+    """
+    Calls of an instrumented function: their count, the cumulative seconds
+    they took and the total length of their last positional argument, the
+    data argument of ftools functions, when it has one
+    """
+
+    __slots__ = ("calls", "seconds", "items", "_lock")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.items = 0
+        self._lock = Lock()
+
+    def reset(self) -> None:
+        """
+        Discards the recorded calls
+        """
+        with self._lock:
+            self.calls = 0
+            self.seconds = 0.0
+            self.items = 0
+
+    def add(self, seconds: float, args: tuple) -> None:
+        """
+        Records a call that took seconds with args
+        """
+        try:
+            size = len(args[-1]) if args else 0
+        except TypeError:
+            size = 0
+        with self._lock:
+            self.calls += 1
+            self.seconds += seconds
+            self.items += size
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        """
+        The recorded statistics as a dictionary
+        """
+        with self._lock:
+            return {"calls": self.calls, "seconds": self.seconds, "items": self.items}
+
+
+_stats: Dict[str, FunctionStats] = {}
+_originals: List[Tuple[object, str, Callable]] = []
+_lock = Lock()
+
+
+def _instrument(func: Callable, stats: FunctionStats) -> Callable:
+    completing: Optional[Callable] = None
+
+    @wraps(func)
+    def instrumented(*args, **kwargs):
+        nonlocal completing
+        start = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            stats.add(perf_counter() - start, args)
+            raise
+        if type(result) is CurriedPartial:  # pylint: disable=unidiomatic-typecheck
+            # Partial application of a curried function: keep it a partial, of
+            # the instrumented function, and record the completing call
+            # pylint: disable=protected-access
+            if completing is None:
+                completing = _instrument(result._complete.func, stats)
+            return CurriedPartial(
+                instrumented, completing, result.args, result.keywords, result._missing
+            )
+        stats.add(perf_counter() - start, args)
+        return result
+
+    return _named_after(instrumented, func)
+
+
+def is_enabled() -> bool:
+    """
+    Whether instrumentation is enabled
+    """
+    return bool(_originals)
+
+
+def enable() -> None:
+    """
+    Instruments the public functions of the ftools modules in MODULES
+    """
+    with _lock:
+        if _originals:
+            return
+        # Imported before patching so their imports get the original functions
+        modules = [import_module(f"{__package__}.{name}") for name in MODULES]
+        for module in modules:
+            for name, value in list(vars(module).items()):
+                full_name = f"{module.__name__}.{name}"
+                if (
+                    name.startswith("_")
+                    or not isfunction(value)
+                    or value.__module__ != module.__name__
+                    or full_name in NOT_INSTRUMENTED
+                ):
+                    continue
+                stats = _stats.setdefault(full_name, FunctionStats())
+                _originals.append((module, name, value))
+                setattr(module, name, _instrument(value, stats))
+
+
+def disable() -> None:
+    """
+    Restores the original functions. Recorded statistics are kept.
+    """
+    with _lock:
+        while _originals:
+            module, name, value = _originals.pop()
+            setattr(module, name, value)
+
+
+def reset() -> None:
+    """
+    Discards the recorded statistics
+    """
+    with _lock:
+        for stats in _stats.values():
+            stats.reset()
+
+
+def snapshot() -> Dict[str, Dict[str, Union[int, float]]]:
+    """
+    The recorded statistics of every called function by its full name
+    """
+    with _lock:
+        items = list(_stats.items())
+    return {name: stats.to_dict() for name, stats in items if stats.calls}
+
+
+METRICS = (
+    ("calls", "ftools_calls_total", "Calls of ftools functions"),
+    ("seconds", "ftools_call_seconds_total", "Seconds spent in ftools functions"),
+    ("items", "ftools_input_items_total", "Items passed to ftools functions"),
+)
+
+
+def prometheus() -> str:
+    """
+    The recorded statistics in the Prometheus text exposition format
+    """
+    current = snapshot()
+    lines = []
+    for key, metric, description in METRICS:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, stats in sorted(current.items()):
+            lines.append(f'{metric}{{function="{name}"}} {stats[key]}')
+    return "\n".join(lines) + "\n"
@@ -5,23 +5,25 @@ Utilities for iterables
 from collections import abc
 from dataclasses import dataclass
 from functools import reduce
-from itertools import tee
-from operator import add
+from itertools import chain, groupby, islice
+from math import nan
 from typing import (
+    AbstractSet,
     Callable,
     Dict,
     Hashable,
+    IO,
     Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
     Union,
 )
 
-from cardinality import count
-
 from .callable import curry, star
 
 T = TypeVar("T")  # pylint: disable=invalid-name
@@ -76,22 +78,61 @@ Number = TypeVar("Number", bound=Union[int, float])
 
 def mean(iterable: Iterable[Number]) -> float:
     """
-    Computes the mean of the values in iterable.
+    Computes the mean of the values in iterable in a single pass.
+    Returns nan for an empty iterable.
     """
-    to_sum, to_count = tee(iterable)
-    _sum = reduce(add, to_sum)
-    return _sum / count(to_count)
+    if isinstance(iterable, abc.Sized):
+        size = len(iterable)
+        return sum(iterable) / size if size else nan
+    total = 0
+    size = 0
+    for size, value in enumerate(iterable, 1):
+        total += value
+    return total / size if size else nan
+
+
+ATOMS: Tuple[type, ...] = (str, bytes, abc.Mapping)
 
 
-def flatten(iterable: Iterable[Union[T, Iterable[T]]]) -> Iterable[T]:
+def flatten(
+    iterable: Iterable[Union[T, Iterable[T]]],
+    depth: Optional[int] = None,
+    atoms: Tuple[type, ...] = ATOMS,
+) -> Iterable[T]:
     """
-    Flattens iterable a single level deep.
+    Flattens iterable, recursively by default or up to depth levels deep.
+    Instances of atoms (str, bytes and mappings by default) are not flattened.
     """
+    if depth == 1:
+        return chain.from_iterable(_wrap_atoms(iterable, atoms))
+    return _flatten(iterable, depth, atoms)
+
+
+def _wrap_atoms(iterable: Iterable, atoms: Tuple[type, ...]) -> Iterable[Iterable]:
     for item in iterable:
-        if isinstance(item, abc.Iterable):
-            yield from flatten(item)
+        if isinstance(item, abc.Iterable) and not isinstance(item, atoms):
+            yield item
         else:
+            yield (item,)
+
+
+def _flatten(
+    iterable: Iterable, depth: Optional[int], atoms: Tuple[type, ...]
+) -> Iterable:
+    # A stack of iterators, one per level, instead of a generator per level
+    stack = [iter(iterable)]
+    while stack:
+        for item in stack[-1]:
+            if (
+                isinstance(item, abc.Iterable)
+                and not isinstance(item, atoms)
+                and (depth is None or len(stack) <= depth)
+            ):
+                stack.append(iter(item))
+                break
             yield item
+        else:
+            stack.pop()
 
 
 G = TypeVar("G")  # pylint: disable=invalid-name
@@ -154,6 +195,129 @@ def flat_group_by(
     return FlatGroupBy(iteratee, iterable)
 
 
+@curry
+def group_by_sorted(
+    iteratee: Callable[[T], G], iterable: Iterable[T]
+) -> Iterable[Tuple[G, List[T]]]:
+    """
+    Like group_by but for an iterable whose items are already sorted, or
+    clustered, by their key: creates an iterable of tuples of key and group
+    that yields each group as soon as the key changes, holding a single group
+    in memory. A key reappearing later in iterable starts a new group.
+    """
+    for key, items in groupby(iterable, iteratee):
+        if not key:
+            continue
+        yield key, list(items)
+
+
+A = TypeVar("A")  # pylint: disable=invalid-name
+
+
+@curry
+def group_reduce(
+    iteratee: Callable[[T], G],
+    reducer: Callable[[A, T], A],
+    initial: A,
+    iterable: Iterable[T],
+) -> Dict[G, A]:
+    """
+    Like group_by but instead of collecting the elements of each group reduces
+    them as they arrive: creates a dict of keys generated by iteratee and the
+    result of reducer(accumulator, value) over the elements of each group,
+    starting from initial. Only one accumulator per key is kept in memory.
+    """
+    accumulators: Dict[G, A] = {}
+
+    for item in iterable:
+        key = iteratee(item)
+
+        if not key:
+            continue
+
+        accumulators[key] = reducer(accumulators.get(key, initial), item)
+
+    return accumulators
+
+
+def _spill(groups: Dict[G, List[T]], files: List[IO[bytes]]) -> None:
+    import pickle  # pylint: disable=import-outside-toplevel
+
+    for key, items in groups.items():
+        pickle.dump(
+            (key, items), files[hash(key) % len(files)], pickle.HIGHEST_PROTOCOL
+        )
+
+
+def _load_groups(file: IO[bytes]) -> Dict[G, List[T]]:
+    import pickle  # pylint: disable=import-outside-toplevel
+
+    groups: Dict[G, List[T]] = {}
+    file.seek(0)
+    while True:
+        try:
+            key, items = pickle.load(file)
+        except EOFError:
+            return groups
+        groups.setdefault(key, []).extend(items)
+
+
+@curry
+def external_group_by(
+    iteratee: Callable[[T], G],
+    iterable: Iterable[T],
+    *,
+    max_items: int = 1000000,
+    partitions: int = 64,
+) -> Iterable[Tuple[G, List[T]]]:
+    """
+    Like group_by but for iterables that don't fit in memory: creates an
+    iterable of tuples of key and group. Whenever max_items elements are held
+    in memory they are pickled to one of partitions temporary files chosen by
+    the hash of their key, and at the end every file is grouped in memory on
+    its own. The order of values within a group is the order they occur in
+    iterable; groups are yielded partition by partition. If iterable has no
+    more than max_items elements nothing is written and groups are yielded in
+    the order of their first element, like group_by.
+    """
+    groups: Dict[G, List[T]] = {}
+    buffered = 0
+    files: List[IO[bytes]] = []
+
+    try:
+        for item in iterable:
+            key = iteratee(item)
+
+            if not key:
+                continue
+
+            groups.setdefault(key, []).append(item)
+            buffered += 1
+
+            if buffered >= max_items:
+                if not files:
+                    # pylint: disable=import-outside-toplevel
+                    from tempfile import TemporaryFile
+
+                    files = [TemporaryFile() for _ in range(partitions)]
+                _spill(groups, files)
+                groups = {}
+                buffered = 0
+
+        if not files:
+            yield from groups.items()
+            return
+
+        _spill(groups, files)
+        del groups
+        for file in files:
+            yield from _load_groups(file).items()
+            file.close()
+    finally:
+        for file in files:
+            file.close()
+
+
 def key_by(iteratee: Callable[[T], G], iterable: Iterable[T]) -> Dict[G, T]:
     """
     Creates a dictionary composed of keys generated from the results of running
@@ -172,16 +336,86 @@ def key_by(iteratee: Callable[[T], G], iterable: Iterable[T]) -> Dict[G, T]:
     return keyed
 
 
-def _get_repeating(iterable):
-    visited = set()
-    for item in iterable:
-        if item in visited:
+HashableItem = TypeVar("HashableItem", bound=Hashable)
+Key = TypeVar("Key", bound=Hashable)
+
+
+def _key_set(key: Optional[Callable[[T], Key]], iterable: Iterable[T]) -> AbstractSet:
+    if key is None:
+        if isinstance(iterable, abc.Set):
+            return iterable
+        return set(iterable)
+    return set(map(key, iterable))
+
+
+def _intersection(
+    key: Optional[Callable[[T], Key]], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    if (
+        isinstance(source, abc.Sized)
+        and isinstance(target, abc.Sized)
+        and len(source) < len(target)
+        and not (key is None and isinstance(target, abc.Set))
+    ):
+        # Index the smaller source and stream the larger target against it,
+        # stopping once every source item was found
+        indexed: Dict[Hashable, T] = {}
+        for item in source:
+            indexed.setdefault(item if key is None else key(item), item)
+        found = set()
+        for item in target:
+            item_key = item if key is None else key(item)
+            if item_key in indexed:
+                found.add(item_key)
+                if len(found) == len(indexed):
+                    break
+        for item_key, item in indexed.items():
+            if item_key in found:
+                yield item
+        return
+
+    target_keys = _key_set(key, target)
+    seen = set()
+    for item in source:
+        item_key = item if key is None else key(item)
+        if item_key in target_keys and item_key not in seen:
+            seen.add(item_key)
             yield item
-        else:
-            visited = {*visited, item}
 
 
-HashableItem = TypeVar("HashableItem", bound=Hashable)
+def _difference(
+    key: Optional[Callable[[T], Key]], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    target_keys = _key_set(key, target)
+    seen = set()
+    for item in source:
+        item_key = item if key is None else key(item)
+        if item_key not in target_keys and item_key not in seen:
+            seen.add(item_key)
+            yield item
+
+
+def _union(
+    key: Optional[Callable[[T], Key]], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    seen = set()
+    for iterable in (source, target):
+        for item in iterable:
+            item_key = item if key is None else key(item)
+            if item_key not in seen:
+                seen.add(item_key)
+                yield item
+
+
+def _symmetric_difference(
+    key: Optional[Callable[[T], Key]], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    source = list(source)
+    target = list(target)
+    yield from _difference(key, source, target)
+    # The swapped order is intentional: items of target missing from source
+    # pylint: disable=arguments-out-of-order
+    yield from _difference(key, target, source)
 
 
 @curry
@@ -193,7 +427,90 @@ def intersection(
     target iterables using hash() for comparisons. The order and references of
     result values are determined by the first iterable.
     """
-    return _get_repeating((*source, *target))
+    return _intersection(None, source, target)
+
+
+@curry
+def intersection_by(
+    key: Callable[[T], Key], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    """
+    This function is like intersection except that it accepts key which is
+    invoked for each element of source and target to generate the criterion by
+    which they are compared.
+    """
+    return _intersection(key, source, target)
+
+
+@curry
+def difference(
+    source: Iterable[HashableItem], target: Iterable[HashableItem]
+) -> Iterable[HashableItem]:
+    """
+    Creates an iterable of unique values of source that are not included in
+    target using hash() for comparisons. The order and references of result
+    values are determined by the first iterable.
+    """
+    return _difference(None, source, target)
+
+
+@curry
+def difference_by(
+    key: Callable[[T], Key], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    """
+    This function is like difference except that it accepts key which is
+    invoked for each element of source and target to generate the criterion by
+    which they are compared.
+    """
+    return _difference(key, source, target)
+
+
+@curry
+def union(
+    source: Iterable[HashableItem], target: Iterable[HashableItem]
+) -> Iterable[HashableItem]:
+    """
+    Creates an iterable of unique values, in order, from source and target
+    using hash() for comparisons.
+    """
+    return _union(None, source, target)
+
+
+@curry
+def union_by(
+    key: Callable[[T], Key], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    """
+    This function is like union except that it accepts key which is invoked
+    for each element of source and target to generate the criterion by which
+    uniqueness is computed.
+    """
+    return _union(key, source, target)
+
+
+@curry
+def symmetric_difference(
+    source: Iterable[HashableItem], target: Iterable[HashableItem]
+) -> Iterable[HashableItem]:
+    """
+    Creates an iterable of unique values that are included in exactly one of
+    source and target using hash() for comparisons. Values of source come
+    first, in order, followed by values of target.
+    """
+    return _symmetric_difference(None, source, target)
+
+
+@curry
+def symmetric_difference_by(
+    key: Callable[[T], Key], source: Iterable[T], target: Iterable[T]
+) -> Iterable[T]:
+    """
+    This function is like symmetric_difference except that it accepts key
+    which is invoked for each element of source and target to generate the
+    criterion by which they are compared.
+    """
+    return _symmetric_difference(key, source, target)
 
 
 Identity = TypeVar("Identity")
@@ -205,21 +522,27 @@ def chunk_by(
 ) -> Iterable[Tuple[T, ...]]:
     """
     Creates an iterable of chunks of iterable defined by the identity returned
-    by given predicate function
+    by given predicate function. Consecutive items with equal identities share
+    a chunk.
     """
     last_identity = None
-    current_chunk: Tuple[T, ...] = tuple()
+    current_chunk: List[T] = []
     for index, item in enumerate(iterable):
         identity = predicate(item, index)
-        if identity is last_identity:
-            current_chunk = current_chunk + (item,)
+        if current_chunk and identity == last_identity:
+            current_chunk.append(item)
         else:
             if current_chunk:
-                yield current_chunk
+                yield tuple(current_chunk)
             last_identity = identity
-            current_chunk = (item,)
+            current_chunk = [item]
     if current_chunk:
-        yield current_chunk
+        yield tuple(current_chunk)
+
+
+def _check_chunk_size(size: int) -> None:
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive, received {size}")
 
 
 @curry
@@ -228,7 +551,32 @@ def chunk(size: int, iterable: Iterable[T]) -> Iterable[Tuple[T, ...]]:
     Creates an iterable of elements split into groups the length of size.
     If iterable can't be split evenly, the final chunk will be the remaining elements.
     """
-    return chunk_by(lambda item, index: index // size, iterable)
+    _check_chunk_size(size)
+    return _chunk(size, iter(iterable))
+
+
+def _chunk(size: int, iterator: Iterator[T]) -> Iterable[Tuple[T, ...]]:
+    while True:
+        current_chunk = tuple(islice(iterator, size))
+        if not current_chunk:
+            return
+        yield current_chunk
+
+
+@curry
+def chunk_slices(size: int, sequence: Sequence[T]) -> Iterable[Sequence[T]]:
+    """
+    Like chunk but for sequences: creates an iterable of slices of sequence
+    the length of size. Objects supporting the buffer protocol, like bytes,
+    bytearray and array.array, are sliced through a memoryview so the chunks
+    are views of sequence and nothing is copied.
+    """
+    _check_chunk_size(size)
+    try:
+        sequence = memoryview(sequence)  # type: ignore
+    except TypeError:
+        pass
+    return (sequence[start : start + size] for start in range(0, len(sequence), size))
 
 
 def uniq(iterable: Iterable[T]) -> Iterable[T]:
@@ -246,9 +594,6 @@ def uniq(iterable: Iterable[T]) -> Iterable[T]:
         yield item
 
 
-Key = TypeVar("Key", bound=Hashable)
-
-
 def uniq_by(key: Callable[[T], Key], iterable: Iterable[T]) -> Iterable[T]:
     """
     This function is like uniq except that it accepts iteratee which is invoked
@@ -275,9 +620,6 @@ def index_of(item: T, iterable: Iterable[T]) -> Optional[int]:
     return None
 
 
-A = TypeVar("A")  # pylint: disable=invalid-name
-
-
 def starreduce(
     function: Callable[[A, T], A], iterable: Iterable[Iterable[T]], initial: A
 ) -> A:
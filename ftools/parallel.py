@@ -0,0 +1,228 @@
+"""
+Parallel versions of utilities for iterables and mappings, running the
+iteratee over chunks of the input on a pool of workers. Unless an executor is
+given a process pool is used, or a thread pool on free threaded Python builds,
+so iteratees must be picklable: module level functions rather than lambdas.
+"""
+
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, repeat
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from . import iterable as _iterable
+from .callable import curry
+from .mapping import create_empty
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+G = TypeVar("G")  # pylint: disable=invalid-name
+R = TypeVar("R")  # pylint: disable=invalid-name
+K = TypeVar("K")  # pylint: disable=invalid-name
+V = TypeVar("V")  # pylint: disable=invalid-name
+K2 = TypeVar("K2")
+V2 = TypeVar("V2")
+
+# Chunks per worker: more than one evens out chunks of uneven cost
+CHUNKS_PER_WORKER = 4
+
+
+def _gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _create_executor(workers: int) -> Executor:
+    if _gil_enabled():
+        return ProcessPoolExecutor(workers)
+    return ThreadPoolExecutor(workers)
+
+
+def _count_workers(executor: Optional[Executor], workers: Optional[int]) -> int:
+    if workers is not None:
+        return workers
+    # pylint: disable=protected-access
+    return getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+
+
+def chunk_size(total: int, workers: int) -> int:
+    """
+    The number of items per chunk when splitting total items between workers
+    """
+    return max(1, -(-total // (workers * CHUNKS_PER_WORKER)))
+
+
+def _apply(func: Callable[[T], R], items: Sequence[T]) -> List[R]:
+    return [func(item) for item in items]
+
+
+def parallel_map(
+    func: Callable[[T], R],
+    items: Sequence[T],
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> Iterable[R]:
+    """
+    Returns func(item) for every item, in order, computed in chunks on given
+    executor, or on a new pool of workers. With a single worker and no
+    executor func is applied in the current process.
+    """
+    workers = _count_workers(executor, workers)
+    if executor is None and workers == 1:
+        return map(func, items)
+    size = chunk_size(len(items), workers)
+    chunks = [items[start : start + size] for start in range(0, len(items), size)]
+    if executor is None:
+        with _create_executor(workers) as pool:
+            results = list(pool.map(_apply, repeat(func, len(chunks)), chunks))
+    else:
+        results = list(executor.map(_apply, repeat(func, len(chunks)), chunks))
+    return chain.from_iterable(results)
+
+
+def _replay(results: Iterable[R]) -> Callable[[object], R]:
+    # An iteratee returning precomputed results in order, which lets the
+    # sequential functions, calling it once per item, do the rest of the work
+    iterator = iter(results)
+    return lambda _item: next(iterator)
+
+
+@curry
+def group_by(
+    iteratee: Callable[[T], G],
+    iterable: Iterable[T],
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> Dict[G, List[T]]:
+    """
+    Like ftools.iterable.group_by but runs iteratee on a pool of workers. The
+    keys of each chunk are merged in the order of iterable, so the groups and
+    their elements keep the order of their first occurrence.
+    """
+    items = list(iterable)
+    keys = parallel_map(iteratee, items, executor, workers)
+    return _iterable.group_by(_replay(keys), items)
+
+
+def key_by(
+    iteratee: Callable[[T], G],
+    iterable: Iterable[T],
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> Dict[G, T]:
+    """
+    Like ftools.iterable.key_by but runs iteratee on a pool of workers. The
+    corresponding value of each key is still the last element responsible for
+    generating the key.
+    """
+    items = list(iterable)
+    keys = parallel_map(iteratee, items, executor, workers)
+    return _iterable.key_by(_replay(keys), items)
+
+
+def partition(
+    predicate: Callable[[T], bool],
+    iterable: Iterable[T],
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> Tuple[Iterable[T], Iterable[T]]:
+    """
+    Like ftools.iterable.partition but runs predicate on a pool of workers.
+    """
+    items = list(iterable)
+    matches = parallel_map(predicate, items, executor, workers)
+    return _iterable.partition(_replay(matches), items)
+
+
+@curry
+def map_values(
+    modifier: Callable[[V], V2],
+    mapping: MutableMapping[K, V],
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> MutableMapping[K, V2]:
+    """
+    Like ftools.mapping.map_values but runs modifier on a pool of workers.
+    The result is a mapping of the type of given mapping with the keys in the
+    same order.
+    """
+    keys = list(mapping)
+    values = [mapping[key] for key in keys]
+    next_mapping = cast(MutableMapping[K, V2], create_empty(mapping))
+    for key, value in zip(keys, parallel_map(modifier, values, executor, workers)):
+        next_mapping[key] = value
+    return next_mapping
+
+
+@curry
+def map_keys(
+    modifier: Callable[[K], K2],
+    mapping: MutableMapping[K, V],
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> MutableMapping[K2, V]:
+    """
+    Like ftools.mapping.map_keys but runs modifier on a pool of workers.
+    """
+    keys = list(mapping)
+    next_mapping = cast(MutableMapping[K2, V], create_empty(mapping))
+    for key, next_key in zip(keys, parallel_map(modifier, keys, executor, workers)):
+        next_mapping[next_key] = mapping[key]
+    return next_mapping
+
+
+@curry
+def pick_by_value(
+    predicate: Callable[[V], bool],
+    mapping: MutableMapping[K, V],
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> MutableMapping[K, V]:
+    """
+    Like ftools.mapping.pick_by_value but runs predicate on a pool of workers.
+    """
+    keys = list(mapping)
+    values = [mapping[key] for key in keys]
+    next_mapping = cast(MutableMapping[K, V], create_empty(mapping))
+    for key, value, matches in zip(
+        keys, values, parallel_map(predicate, values, executor, workers)
+    ):
+        if matches:
+            next_mapping[key] = value
+    return next_mapping
+
+
+@curry
+def pick_by_key(
+    predicate: Callable[[K], bool],
+    mapping: MutableMapping[K, V],
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> MutableMapping[K, V]:
+    """
+    Like ftools.mapping.pick_by_key but runs predicate on a pool of workers.
+    """
+    keys = list(mapping)
+    next_mapping = cast(MutableMapping[K, V], create_empty(mapping))
+    for key, matches in zip(keys, parallel_map(predicate, keys, executor, workers)):
+        if matches:
+            next_mapping[key] = mapping[key]
+    return next_mapping
@@ -0,0 +1,630 @@
+"""
+Persistent collections: immutable mappings and sequences that share structure
+between versions
+"""
+
+from collections import abc
+from typing import (
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K")  # pylint: disable=invalid-name
+V = TypeVar("V")  # pylint: disable=invalid-name
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+
+# PersistentMap is a hash array mapped trie. Leaf entries are (hash, key, value)
+# tuples, inner nodes are _BitmapNode and _CollisionNode instances.
+
+# Exact type checks tell leaf tuples from nodes on the hot paths, where they
+# are cheaper than isinstance and no subclasses are involved
+# pylint: disable=unidiomatic-typecheck
+
+Entry = Tuple[int, K, V]
+
+
+def _replace(array: tuple, index: int, item) -> tuple:
+    return array[:index] + (item,) + array[index + 1 :]
+
+
+def _bitpos(key_hash: int, shift: int) -> int:
+    return 1 << ((key_hash >> shift) & _MASK)
+
+
+def _index(bitmap: int, bit: int) -> int:
+    return bin(bitmap & (bit - 1)).count("1")
+
+
+def _merge(first: Entry, second: Entry, shift: int):
+    if first[0] == second[0]:
+        return _CollisionNode(first[0], (first, second))
+    first_bit = _bitpos(first[0], shift)
+    second_bit = _bitpos(second[0], shift)
+    if first_bit == second_bit:
+        return _BitmapNode(first_bit, (_merge(first, second, shift + _BITS),))
+    if first_bit < second_bit:
+        return _BitmapNode(first_bit | second_bit, (first, second))
+    return _BitmapNode(first_bit | second_bit, (second, first))
+
+
+def _collapse(node):
+    """
+    Inline a node left with a single entry into its parent
+    """
+    if len(node.array) == 1 and type(node.array[0]) is tuple:
+        return node.array[0]
+    return node
+
+
+class _BitmapNode:
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap: int, array: tuple) -> None:
+        self.bitmap = bitmap
+        self.array = array
+
+    def assoc(self, shift: int, entry: Entry):
+        """
+        Returns a node with entry set and whether a new key was added
+        """
+        bit = _bitpos(entry[0], shift)
+        index = _index(self.bitmap, bit)
+        if not self.bitmap & bit:
+            array = self.array[:index] + (entry,) + self.array[index:]
+            return _BitmapNode(self.bitmap | bit, array), True
+        current = self.array[index]
+        if type(current) is tuple:
+            if current[0] == entry[0] and (
+                current[1] is entry[1] or current[1] == entry[1]
+            ):
+                if current[2] is entry[2]:
+                    return self, False
+                node, added = entry, False
+            else:
+                node, added = _merge(current, entry, shift + _BITS), True
+        else:
+            node, added = current.assoc(shift + _BITS, entry)
+            if node is current:
+                return self, False
+        return _BitmapNode(self.bitmap, _replace(self.array, index, node)), added
+
+    def without(self, shift: int, key_hash: int, key):
+        """
+        Returns a node without key, or None if it would be empty
+        """
+        bit = _bitpos(key_hash, shift)
+        if not self.bitmap & bit:
+            raise KeyError(key)
+        index = _index(self.bitmap, bit)
+        current = self.array[index]
+        if type(current) is tuple:
+            if current[0] != key_hash or not (current[1] is key or current[1] == key):
+                raise KeyError(key)
+            node = None
+        else:
+            node = current.without(shift + _BITS, key_hash, key)
+        if node is None:
+            if len(self.array) == 1:
+                return None
+            array = self.array[:index] + self.array[index + 1 :]
+            return _BitmapNode(self.bitmap ^ bit, array)
+        return _BitmapNode(self.bitmap, _replace(self.array, index, _collapse(node)))
+
+
+class _CollisionNode:
+    __slots__ = ("key_hash", "array")
+
+    def __init__(self, key_hash: int, array: tuple) -> None:
+        self.key_hash = key_hash
+        self.array = array
+
+    def _find_index(self, key) -> int:
+        for index, entry in enumerate(self.array):
+            if entry[1] is key or entry[1] == key:
+                return index
+        return -1
+
+    def assoc(self, shift: int, entry: Entry):
+        """
+        Returns a node with entry set and whether a new key was added
+        """
+        if entry[0] != self.key_hash:
+            node = _BitmapNode(_bitpos(self.key_hash, shift), (self,))
+            return node.assoc(shift, entry)
+        index = self._find_index(entry[1])
+        if index == -1:
+            return _CollisionNode(self.key_hash, self.array + (entry,)), True
+        if self.array[index][2] is entry[2]:
+            return self, False
+        return _CollisionNode(self.key_hash, _replace(self.array, index, entry)), False
+
+    def without(self, _shift: int, key_hash: int, key):
+        """
+        Returns a node without key, or None if it would be empty
+        """
+        index = self._find_index(key) if key_hash == self.key_hash else -1
+        if index == -1:
+            raise KeyError(key)
+        if len(self.array) == 1:
+            return None
+        array = self.array[:index] + self.array[index + 1 :]
+        return _CollisionNode(self.key_hash, array)
+
+
+def _find(root: _BitmapNode, key_hash: int, key) -> Optional[Entry]:
+    node = root
+    shift = 0
+    while True:
+        if type(node) is _CollisionNode:
+            if node.key_hash != key_hash:
+                return None
+            index = node._find_index(key)  # pylint: disable=protected-access
+            return None if index == -1 else node.array[index]
+        bit = _bitpos(key_hash, shift)
+        if not node.bitmap & bit:
+            return None
+        node = node.array[_index(node.bitmap, bit)]
+        if type(node) is tuple:
+            if node[0] == key_hash and (node[1] is key or node[1] == key):
+                return node
+            return None
+        shift += _BITS
+
+
+def _iter_entries(node) -> Iterator[Entry]:
+    for entry in node.array:
+        if type(entry) is tuple:
+            yield entry
+        else:
+            yield from _iter_entries(entry)
+
+
+_EMPTY_NODE = _BitmapNode(0, ())
+
+
+class PersistentMap(Mapping[K, V]):
+    """
+    An immutable mapping. set() and delete() return new mappings in O(log n)
+    sharing all but the changed path with the original one.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self) -> None:
+        self._root = _EMPTY_NODE
+        self._size = 0
+
+    @classmethod
+    def _create(cls, root: _BitmapNode, size: int) -> "PersistentMap[K, V]":
+        mapping = cls.__new__(cls)
+        mapping._root = root
+        mapping._size = size
+        return mapping
+
+    def __getitem__(self, key: K) -> V:
+        entry = _find(self._root, hash(key) & _HASH_MASK, key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[2]
+
+    def get(self, key, default=None):
+        entry = _find(self._root, hash(key) & _HASH_MASK, key)
+        return default if entry is None else entry[2]
+
+    def __contains__(self, key) -> bool:
+        return _find(self._root, hash(key) & _HASH_MASK, key) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[K]:
+        return (entry[1] for entry in _iter_entries(self._root))
+
+    def items(self):
+        return _PersistentMapItems(self)
+
+    def values(self):
+        return _PersistentMapValues(self)
+
+    def set(self, key: K, value: V) -> "PersistentMap[K, V]":
+        """
+        Returns a mapping with key set to value
+        """
+        root, added = self._root.assoc(0, (hash(key) & _HASH_MASK, key, value))
+        if root is self._root:
+            return self
+        return self._create(root, self._size + 1 if added else self._size)
+
+    def delete(self, key: K) -> "PersistentMap[K, V]":
+        """
+        Returns a mapping without key. Raises KeyError if key is missing.
+        """
+        root = self._root.without(0, hash(key) & _HASH_MASK, key)
+        return self._create(_EMPTY_NODE if root is None else root, self._size - 1)
+
+    def update(self, mapping: Mapping[K, V]) -> "PersistentMap[K, V]":
+        """
+        Returns a mapping with the items of given mapping set
+        """
+        evolver = self.evolver()
+        for key, value in mapping.items():
+            evolver[key] = value
+        return evolver.persistent()
+
+    def evolver(self) -> "PersistentMapEvolver[K, V]":
+        """
+        Returns a mutable mapping starting from this mapping
+        """
+        return PersistentMapEvolver(self)
+
+    def __copy__(self) -> "PersistentMap[K, V]":
+        return self
+
+    def __reduce__(self):
+        return pmap, (dict(self.items()),)
+
+    def __repr__(self) -> str:
+        return f"pmap({dict(self.items())!r})"
+
+
+class _PersistentMapItems(abc.ItemsView):  # pylint: disable=too-many-ancestors
+    def __iter__(self):
+        for entry in _iter_entries(self._mapping._root):
+            yield entry[1], entry[2]
+
+
+class _PersistentMapValues(abc.ValuesView):  # pylint: disable=too-few-public-methods
+    def __iter__(self):
+        for entry in _iter_entries(self._mapping._root):
+            yield entry[2]
+
+
+class PersistentMapEvolver(MutableMapping[K, V]):
+    """
+    A mutable mapping over a persistent mapping. Every change replaces the
+    underlying persistent mapping which is returned by persistent().
+    """
+
+    __slots__ = ("_mapping",)
+
+    def __init__(self, mapping: Optional[PersistentMap[K, V]] = None) -> None:
+        self._mapping = PersistentMap() if mapping is None else mapping
+
+    def __getitem__(self, key: K) -> V:
+        return self._mapping[key]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._mapping = self._mapping.set(key, value)
+
+    def __delitem__(self, key: K) -> None:
+        self._mapping = self._mapping.delete(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._mapping
+
+    def __len__(self) -> int:
+        return len(self._mapping)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._mapping)
+
+    def persistent(self) -> PersistentMap[K, V]:
+        """
+        Returns the current persistent mapping
+        """
+        return self._mapping
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._mapping!r})"
+
+
+def pmap(mapping: Optional[Mapping[K, V]] = None) -> PersistentMap[K, V]:
+    """
+    Creates a persistent mapping with the items of given mapping
+    """
+    if mapping is None:
+        return PersistentMap()
+    return PersistentMap().update(mapping)
+
+
+# PersistentVector is a trie of 32 wide tuples holding all but the last items,
+# which are kept in a tail tuple so appends don't touch the trie most of the time.
+
+
+def _new_path(level: int, node: tuple) -> tuple:
+    while level:
+        node = (node,)
+        level -= _BITS
+    return node
+
+
+def _push_tail(size: int, level: int, parent: tuple, tail: tuple) -> tuple:
+    index = ((size - 1) >> level) & _MASK
+    if level == _BITS:
+        node = tail
+    elif index < len(parent):
+        node = _push_tail(size, level - _BITS, parent[index], tail)
+    else:
+        node = _new_path(level - _BITS, tail)
+    if index < len(parent):
+        return _replace(parent, index, node)
+    return parent + (node,)
+
+
+def _pop_tail(size: int, level: int, node: tuple) -> Optional[tuple]:
+    index = ((size - 2) >> level) & _MASK
+    if level > _BITS:
+        child = _pop_tail(size, level - _BITS, node[index])
+        if child is None:
+            return None if index == 0 else node[:index]
+        return _replace(node, index, child)
+    return None if index == 0 else node[:index]
+
+
+def _assoc(level: int, node: tuple, index: int, value) -> tuple:
+    if level == 0:
+        return _replace(node, index & _MASK, value)
+    child_index = (index >> level) & _MASK
+    child = _assoc(level - _BITS, node[child_index], index, value)
+    return _replace(node, child_index, child)
+
+
+class PersistentVector(Sequence[T]):
+    """
+    An immutable sequence. append(), set() and pop() return new sequences in
+    O(log n) sharing all but the changed path with the original one.
+    """
+
+    __slots__ = ("_size", "_shift", "_root", "_tail")
+
+    def __init__(self) -> None:
+        self._size = 0
+        self._shift = _BITS
+        self._root: tuple = ()
+        self._tail: tuple = ()
+
+    @classmethod
+    def _create(
+        cls, size: int, shift: int, root: tuple, tail: tuple
+    ) -> "PersistentVector[T]":
+        vector = cls.__new__(cls)
+        vector._size = size
+        vector._shift = shift
+        vector._root = root
+        vector._tail = tail
+        return vector
+
+    def _leaf(self, index: int) -> tuple:
+        if index >= self._size - len(self._tail):
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level:
+            node = node[(index >> level) & _MASK]
+            level -= _BITS
+        return node
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("pvector index out of range")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return pvector(self[i] for i in range(*index.indices(self._size)))
+        index = self._normalize(index)
+        return self._leaf(index)[index & _MASK]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        for start in range(0, self._size - len(self._tail), _WIDTH):
+            yield from self._leaf(start)
+        yield from self._tail
+
+    def append(self, value: T) -> "PersistentVector[T]":
+        """
+        Returns a sequence with value added at the end
+        """
+        size, shift, root, tail = self._size, self._shift, self._root, self._tail
+        if len(tail) < _WIDTH:
+            return self._create(size + 1, shift, root, tail + (value,))
+        if (size >> _BITS) > (1 << shift):
+            root = (root, _new_path(shift, tail))
+            shift += _BITS
+        else:
+            root = _push_tail(size, shift, root, tail)
+        return self._create(size + 1, shift, root, (value,))
+
+    def extend(self, iterable: Iterable[T]) -> "PersistentVector[T]":
+        """
+        Returns a sequence with the items of iterable added at the end
+        """
+        vector = self
+        for item in iterable:
+            vector = vector.append(item)
+        return vector
+
+    def set(self, index: int, value: T) -> "PersistentVector[T]":
+        """
+        Returns a sequence with the item at index replaced by value. Setting the
+        index right after the last item appends value.
+        """
+        if index == self._size:
+            return self.append(value)
+        index = self._normalize(index)
+        tail_offset = self._size - len(self._tail)
+        if index >= tail_offset:
+            tail = _replace(self._tail, index - tail_offset, value)
+            return self._create(self._size, self._shift, self._root, tail)
+        root = _assoc(self._shift, self._root, index, value)
+        return self._create(self._size, self._shift, root, self._tail)
+
+    def pop(self) -> "PersistentVector[T]":
+        """
+        Returns a sequence without the last item
+        """
+        size, shift = self._size, self._shift
+        if size == 0:
+            raise IndexError("pop from empty pvector")
+        if size == 1:
+            return _EMPTY_VECTOR
+        if len(self._tail) > 1:
+            return self._create(size - 1, shift, self._root, self._tail[:-1])
+        tail = self._leaf(size - 2)
+        root = _pop_tail(size, shift, self._root) or ()
+        if shift > _BITS and len(root) == 1:
+            root = root[0]
+            shift -= _BITS
+        return self._create(size - 1, shift, root, tail)
+
+    def delete(self, index: int) -> "PersistentVector[T]":
+        """
+        Returns a sequence without the item at index. Deleting any item but the
+        last one rebuilds the sequence.
+        """
+        index = self._normalize(index)
+        if index == self._size - 1:
+            return self.pop()
+        items = list(self)
+        del items[index]
+        return pvector(items)
+
+    def insert(self, index: int, value: T) -> "PersistentVector[T]":
+        """
+        Returns a sequence with value inserted before index. Inserting anywhere
+        but at the end rebuilds the sequence.
+        """
+        if index >= self._size:
+            return self.append(value)
+        items = list(self)
+        items.insert(index, value)
+        return pvector(items)
+
+    def evolver(self) -> "PersistentVectorEvolver[T]":
+        """
+        Returns a mutable sequence starting from this sequence
+        """
+        return PersistentVectorEvolver(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PersistentVector):
+            return self._size == other._size and list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __copy__(self) -> "PersistentVector[T]":
+        return self
+
+    def __reduce__(self):
+        return pvector, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"pvector({list(self)!r})"
+
+
+_EMPTY_VECTOR: PersistentVector = PersistentVector()
+
+
+class PersistentVectorEvolver(MutableSequence[T]):
+    """
+    A mutable sequence over a persistent sequence. Every change replaces the
+    underlying persistent sequence which is returned by persistent().
+    """
+
+    __slots__ = ("_vector",)
+
+    def __init__(self, vector: Optional[PersistentVector[T]] = None) -> None:
+        self._vector = _EMPTY_VECTOR if vector is None else vector
+
+    def __getitem__(self, index):
+        return self._vector[index]
+
+    def __setitem__(self, index, value) -> None:
+        self._vector = self._vector.set(index, value)
+
+    def __delitem__(self, index) -> None:
+        self._vector = self._vector.delete(index)
+
+    def __len__(self) -> int:
+        return len(self._vector)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._vector)
+
+    def insert(self, index: int, value: T) -> None:
+        self._vector = self._vector.insert(index, value)
+
+    def append(self, value: T) -> None:
+        self._vector = self._vector.append(value)
+
+    def persistent(self) -> PersistentVector[T]:
+        """
+        Returns the current persistent sequence
+        """
+        return self._vector
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._vector!r})"
+
+
+def pvector(iterable: Iterable[T] = ()) -> PersistentVector[T]:
+    """
+    Creates a persistent sequence with the items of iterable
+    """
+    items = tuple(iterable)
+    if len(items) <= _WIDTH:
+        return PersistentVector._create(  # pylint: disable=protected-access
+            len(items), _BITS, (), items
+        )
+    tail_offset = ((len(items) - 1) >> _BITS) << _BITS
+    nodes = [items[i : i + _WIDTH] for i in range(0, tail_offset, _WIDTH)]
+    shift = _BITS
+    while len(nodes) > _WIDTH:
+        nodes = [tuple(nodes[i : i + _WIDTH]) for i in range(0, len(nodes), _WIDTH)]
+        shift += _BITS
+    return PersistentVector._create(  # pylint: disable=protected-access
+        len(items), shift, tuple(nodes), items[tail_offset:]
+    )
+
+
+def freeze(collection):
+    """
+    Recursively converts mappings to persistent mappings and lists to persistent
+    sequences
+    """
+    if isinstance(collection, abc.Mapping):
+        return pmap({key: freeze(value) for key, value in collection.items()})
+    if isinstance(collection, (list, PersistentVector)):
+        return pvector(freeze(item) for item in collection)
+    return collection
+
+
+def thaw(collection):
+    """
+    Recursively converts persistent mappings to dicts and persistent sequences
+    to lists
+    """
+    if isinstance(collection, abc.Mapping):
+        return {key: thaw(value) for key, value in collection.items()}
+    if isinstance(collection, (list, PersistentVector)):
+        return [thaw(item) for item in collection]
+    return collection
@@ -0,0 +1,270 @@
+"""
+Pipelines of operations over iterables that chain adjacent element-wise
+stages into a single step
+"""
+
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import iterable as _iterable
+
+Stage = Tuple[str, Any]
+
+
+def _map_stage(func: Callable, iterator: Iterable) -> Iterable:
+    return map(func, iterator)
+
+
+def _filter_stage(predicate: Callable, iterator: Iterable) -> Iterable:
+    return filter(predicate, iterator)
+
+
+def _starfilter_stage(predicate: Callable, iterator: Iterable) -> Iterable:
+    return _iterable.starfilter(predicate, iterator)
+
+
+def _compact_stage(_argument: None, iterator: Iterable) -> Iterable:
+    return filter(None, iterator)
+
+
+def _uniq_stage(_argument: None, iterator: Iterable) -> Iterable:
+    # A generator checks the seen set faster than a filter over a closure
+    return _iterable.uniq(iterator)
+
+
+def _uniq_by_stage(key: Callable, iterator: Iterable) -> Iterable:
+    return _iterable.uniq_by(key, iterator)
+
+
+# Chains the iterator of an element-wise stage to the iterator of the
+# previous stages, by kind of stage
+_STAGES: Dict[str, Callable[[Any, Iterable], Iterable]] = {
+    "map": _map_stage,
+    "filter": _filter_stage,
+    "starfilter": _starfilter_stage,
+    "compact": _compact_stage,
+    "uniq": _uniq_stage,
+    "uniq_by": _uniq_by_stage,
+}
+
+# Stages that look at one element at a time and can be chained
+ELEMENT_WISE = frozenset(_STAGES)
+# Stages that end the pipeline by returning a single element
+TERMINAL = frozenset(("find", "head"))
+
+
+def _fuse(stages: Sequence[Stage], terminal: Optional[Stage]) -> Callable:
+    """
+    Combines element-wise stages, optionally followed by a terminal stage,
+    into a single function over an iterable that chains their iterators,
+    builtin map and filter ones where possible, without calling back into
+    Python between stages
+    """
+    chained = [(_STAGES[kind], argument) for kind, argument in stages]
+
+    def fused(iterable: Iterable) -> Iterable:
+        iterator: Iterable = iter(iterable)
+        for stage, argument in chained:
+            iterator = stage(argument, iterator)
+        return iterator
+
+    if terminal is None:
+        return fused
+    kind, predicate = terminal
+    if kind == "find":
+        return lambda iterable: next(filter(predicate, fused(iterable)), None)
+    return lambda iterable: next(fused(iterable), None)
+
+
+def _boundary(kind: str, argument: Any) -> Callable:
+    if kind == "chunk":
+        return partial(_iterable.chunk, argument)
+    if kind == "flatten":
+        return partial(_iterable.flatten, depth=argument)
+    return argument
+
+
+def _compile(stages: Sequence[Stage]) -> List[Tuple[str, Callable]]:
+    """
+    Groups stages into steps: runs of element-wise stages, with a following
+    terminal stage if any, become a single fused step
+    """
+    steps: List[Tuple[str, Callable]] = []
+    run: List[Stage] = []
+    for stage in stages:
+        kind, argument = stage
+        if kind in ELEMENT_WISE:
+            run.append(stage)
+        elif kind in TERMINAL:
+            names = [name for name, _ in run] + [kind]
+            steps.append((" > ".join(names), _fuse(run, stage)))
+            run = []
+        else:
+            if run:
+                steps.append((" > ".join(name for name, _ in run), _fuse(run, None)))
+                run = []
+            steps.append((kind, _boundary(kind, argument)))
+    if run:
+        steps.append((" > ".join(name for name, _ in run), _fuse(run, None)))
+    return steps
+
+
+class Pipeline:
+    """
+    An immutable sequence of operations over an iterable. Adjacent map,
+    filter, compact, uniq, uniq_by and starfilter stages are chained into a
+    single step of builtin map and filter iterators where possible, find and
+    head stop consuming the iterable at the first match, and chunk, flatten
+    and apply stages separate the fused steps. Calling the pipeline with an iterable runs it lazily,
+    unless it ends with find or head.
+    """
+
+    __slots__ = ("stages", "_steps")
+
+    def __init__(self, stages: Iterable[Stage] = ()) -> None:
+        self.stages: Tuple[Stage, ...] = tuple(stages)
+        self._steps: Optional[List[Tuple[str, Callable]]] = None
+
+    def _then(self, kind: str, argument: Any = None) -> "Pipeline":
+        if self.stages and self.stages[-1][0] in TERMINAL:
+            raise ValueError(f"Can not add {kind} after {self.stages[-1][0]}")
+        return type(self)(self.stages + ((kind, argument),))
+
+    def map(self, func: Callable) -> "Pipeline":
+        """
+        Adds a stage that replaces every element with func(element)
+        """
+        return self._then("map", func)
+
+    def filter(self, predicate: Callable) -> "Pipeline":
+        """
+        Adds a stage that keeps the elements predicate returns truthy for
+        """
+        return self._then("filter", predicate)
+
+    def starfilter(self, predicate: Callable) -> "Pipeline":
+        """
+        Adds a stage that keeps the elements predicate(*element) returns
+        truthy for
+        """
+        return self._then("starfilter", predicate)
+
+    def compact(self) -> "Pipeline":
+        """
+        Adds a stage that removes falsey elements
+        """
+        return self._then("compact")
+
+    def uniq(self) -> "Pipeline":
+        """
+        Adds a stage that keeps the first occurrence of every element
+        """
+        return self._then("uniq")
+
+    def uniq_by(self, key: Callable) -> "Pipeline":
+        """
+        Adds a stage that keeps the first element of every key(element)
+        """
+        return self._then("uniq_by", key)
+
+    def chunk(self, size: int) -> "Pipeline":
+        """
+        Adds a stage that splits the elements into tuples of size
+        """
+        # Fail when building the pipeline rather than when running it
+        _iterable.chunk(size, ())
+        return self._then("chunk", size)
+
+    def flatten(self, depth: Optional[int] = None) -> "Pipeline":
+        """
+        Adds a stage that flattens the elements up to depth
+        """
+        return self._then("flatten", depth)
+
+    def apply(self, func: Callable[[Iterable], Any]) -> "Pipeline":
+        """
+        Adds a stage that calls func with the whole iterable
+        """
+        return self._then("apply", func)
+
+    def find(self, predicate: Callable) -> "Pipeline":
+        """
+        Ends the pipeline with the first element predicate returns truthy
+        for, or None
+        """
+        return self._then("find", predicate)
+
+    def head(self) -> "Pipeline":
+        """
+        Ends the pipeline with the first element, or None
+        """
+        return self._then("head")
+
+    @classmethod
+    def from_funcs(cls, funcs: Iterable[Callable]) -> "Pipeline":
+        """
+        Creates a pipeline from the functions given to ftools.callable.flow,
+        recognising the ftools iterable operations and partial applications
+        of map and filter. Other functions become apply stages.
+        """
+        pipeline = cls()
+        for func in funcs:
+            # pylint: disable=protected-access
+            pipeline = pipeline._then(*_recognise(func))
+        return pipeline
+
+    def explain(self) -> str:
+        """
+        Describes the steps the pipeline runs, one per line, with fused
+        stages joined by >
+        """
+        return "\n".join(
+            f"{index}. {name}" for index, (name, _) in enumerate(self._compiled(), 1)
+        )
+
+    def _compiled(self) -> List[Tuple[str, Callable]]:
+        if self._steps is None:
+            self._steps = _compile(self.stages)
+        return self._steps
+
+    def __call__(self, iterable: Iterable) -> Any:
+        result: Any = iterable
+        for _, step in self._compiled():
+            result = step(result)
+        return result
+
+    def __repr__(self) -> str:
+        stages = ", ".join(
+            kind if argument is None else f"{kind}({argument!r})"
+            for kind, argument in self.stages
+        )
+        return f"{type(self).__name__}([{stages}])"
+
+
+def _recognise(func: Callable) -> Stage:
+    # Looked up on every call since instrument.enable() replaces them
+    for known, kind in (
+        (_iterable.compact, "compact"),
+        (_iterable.uniq, "uniq"),
+        (_iterable.head, "head"),
+        (_iterable.flatten, "flatten"),
+    ):
+        if func is known:
+            return kind, None
+    inner = getattr(func, "func", None)
+    args = getattr(func, "args", ())
+    if inner is not None and len(args) == 1 and not getattr(func, "keywords", None):
+        (argument,) = args
+        if inner is filter and argument is None:
+            return "compact", None
+        for known, kind in (
+            (map, "map"),
+            (filter, "filter"),
+            (_iterable.find, "find"),
+            (_iterable.chunk, "chunk"),
+            (_iterable.uniq_by, "uniq_by"),
+            (_iterable.starfilter, "starfilter"),
+        ):
+            if inner is known:
+                return kind, argument
+    return "apply", func
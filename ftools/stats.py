@@ -0,0 +1,165 @@
+"""
+Utilities for statistics over streams of numbers
+"""
+
+import sys
+from array import array
+from itertools import repeat
+from math import fsum, nan, sqrt
+from operator import mul, sub
+from typing import Iterable, Optional, Union
+
+Number = Union[int, float]
+
+
+class OnlineStats:
+    """
+    Accumulates the count, sum, mean, variance, min and max of numbers in a
+    single pass and constant memory using Welford's algorithm. Numbers can be
+    added one at a time with add() or in batches with extend(), and
+    accumulators of different parts of a dataset can be combined with merge().
+    """
+
+    __slots__ = ("count", "sum", "min", "max", "_mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum: Number = 0
+        self.min: Optional[Number] = None
+        self.max: Optional[Number] = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def mean(self) -> float:
+        """
+        The mean of the added numbers, nan if none were added
+        """
+        return self._mean if self.count else nan
+
+    @property
+    def variance(self) -> float:
+        """
+        The population variance of the added numbers, nan if none were added
+        """
+        return self._m2 / self.count if self.count else nan
+
+    @property
+    def sample_variance(self) -> float:
+        """
+        The sample variance of the added numbers, nan if less than two were
+        added
+        """
+        return self._m2 / (self.count - 1) if self.count > 1 else nan
+
+    @property
+    def stdev(self) -> float:
+        """
+        The population standard deviation of the added numbers
+        """
+        return sqrt(self.variance)
+
+    def add(self, value: Number) -> "OnlineStats":
+        """
+        Adds a single number
+        """
+        self.count += 1
+        self.sum += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        return self
+
+    def extend(self, values: Iterable[Number]) -> "OnlineStats":
+        """
+        Adds the numbers of values. NumPy arrays are summarised with NumPy and
+        lists, tuples and arrays with builtin functions, without a Python level
+        loop per number. Other iterables are consumed one number at a time.
+        """
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            return self.merge(_from_ndarray(values))
+        if isinstance(values, (list, tuple, array)):
+            return self.merge(_from_buffer(values))
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "OnlineStats") -> "OnlineStats":
+        """
+        Adds the numbers accumulated by other, using the pairwise update of
+        Chan et al.
+        """
+        # pylint: disable=protected-access
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.sum = other.count, other.sum
+            self.min, self.max = other.min, other.max
+            self._mean, self._m2 = other._mean, other._m2
+            return self
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)  # type: ignore
+        self.max = max(self.max, other.max)  # type: ignore
+        return self
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(count={self.count}, sum={self.sum}, "
+            f"mean={self.mean}, variance={self.variance}, "
+            f"min={self.min}, max={self.max})"
+        )
+
+
+def _from_buffer(values) -> OnlineStats:
+    # pylint: disable=protected-access
+    stats = OnlineStats()
+    if not values:
+        return stats
+    count = len(values)
+    # Summing around the first value keeps the squares small
+    shift = values[0]
+    shifted = list(map(sub, values, repeat(shift, count)))
+    shifted_sum = fsum(shifted)
+    stats.count = count
+    stats.sum = sum(values)
+    stats.min = min(values)
+    stats.max = max(values)
+    stats._mean = shift + shifted_sum / count
+    stats._m2 = max(
+        fsum(map(mul, shifted, shifted)) - shifted_sum * shifted_sum / count, 0.0
+    )
+    return stats
+
+
+def _from_ndarray(values) -> OnlineStats:
+    # pylint: disable=protected-access
+    stats = OnlineStats()
+    values = values.ravel()
+    if not values.size:
+        return stats
+    mean = values.mean()
+    deviations = values - mean
+    stats.count = values.size
+    stats.sum = values.sum().item()
+    stats.min = values.min().item()
+    stats.max = values.max().item()
+    stats._mean = mean.item()
+    stats._m2 = (deviations * deviations).sum().item()
+    return stats
+
+
+def describe(iterable: Iterable[Number]) -> OnlineStats:
+    """
+    Computes the statistics of the numbers in iterable in a single pass
+    """
+    return OnlineStats().extend(iterable)
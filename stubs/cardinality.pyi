@@ -1,3 +0,0 @@
-from typing import Iterable
-
-def count(iterable: Iterable) -> int: ...
@@ -0,0 +1,114 @@
+import asyncio
+import math
+
+import pytest
+from ftools import aiterable
+
+
+def run(awaitable):
+    return asyncio.run(awaitable)
+
+
+async def agen(items):
+    for item in items:
+        await asyncio.sleep(0)
+        yield item
+
+
+async def is_even(value):
+    await asyncio.sleep(0)
+    return value % 2 == 0
+
+
+def collect(iterable):
+    return run(aiterable.to_list(iterable))
+
+
+def test_compact():
+    assert collect(aiterable.compact(agen([0, 1, None, 2, ""]))) == [1, 2]
+    assert collect(aiterable.compact([0, 3])) == [3]
+
+
+def test_find():
+    assert run(aiterable.find(is_even, agen([1, 3, 4, 6]))) == 4
+    assert run(aiterable.find(lambda value: value > 5, agen([1, 2]))) is None
+    assert run(aiterable.find_index(is_even)(agen([1, 3, 4]))) == 2
+    assert run(aiterable.find_index(is_even, [])) is None
+    assert run(aiterable.head(agen([5, 6]))) == 5
+    assert run(aiterable.head([])) is None
+
+
+def test_mean():
+    assert run(aiterable.mean(agen([1, 2, 3, 4]))) == 2.5
+    assert math.isnan(run(aiterable.mean(agen([]))))
+
+
+def test_flatten():
+    nested = agen([1, [2, agen([3, [4]])], "ab", agen([])])
+    assert collect(aiterable.flatten(nested)) == [1, 2, 3, 4, "ab"]
+    assert collect(aiterable.flatten([1, [2, [3]]], depth=1)) == [1, 2, [3]]
+
+
+def test_group_by():
+    assert run(aiterable.group_by(is_even, agen([1, 2, 3, 4]))) == {True: [2, 4]}
+    assert run(aiterable.group_by(len, ["a", "bb", "", "c"])) == {
+        1: ["a", "c"],
+        2: ["bb"],
+    }
+
+
+def test_chunk():
+    assert collect(aiterable.chunk(2, agen(range(5)))) == [(0, 1), (2, 3), (4,)]
+    assert collect(aiterable.chunk(2, agen([]))) == []
+    with pytest.raises(ValueError):
+        aiterable.chunk(0, agen([1]))
+    assert collect(
+        aiterable.chunk_by(lambda value, _: value // 10, agen([1, 2, 11, 3]))
+    ) == [(1, 2), (11,), (3,)]
+
+
+def test_uniq():
+    assert collect(aiterable.uniq(agen([1, 2, 1, 3, 2]))) == [1, 2, 3]
+    assert collect(aiterable.uniq_by(is_even, agen([1, 2, 3, 4]))) == [1, 2]
+
+
+def test_partition():
+    assert run(aiterable.partition(is_even, agen(range(5)))) == ([0, 2, 4], [1, 3])
+
+
+def test_amap():
+    running = 0
+    peak = 0
+
+    async def double(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001 * (5 - value))
+        running -= 1
+        return value * 2
+
+    assert collect(aiterable.amap(double, agen(range(5)), concurrency=3)) == [
+        0,
+        2,
+        4,
+        6,
+        8,
+    ]
+    assert peak == 3
+    assert collect(aiterable.amap(str, [1, 2])) == ["1", "2"]
+    with pytest.raises(ValueError):
+        collect(aiterable.amap(str, [1], concurrency=0))
+
+
+def test_flow():
+    async def increment(value):
+        return value + 1
+
+    assert run(aiterable.flow([increment, str], 1)) == "2"
+    pipeline = aiterable.flow([aiterable.compact, aiterable.uniq, aiterable.to_list])
+    assert run(pipeline(agen([0, 1, 1, 2]))) == [1, 2]
+    # funcs are taken once, the composition can run many times
+    twice = aiterable.flow(func for func in (increment, increment))
+    assert run(twice(1)) == 3
+    assert run(twice(2)) == 4
@@ -1,20 +1,37 @@
+import asyncio
+import pickle
+import time
 import warnings
 from functools import partial
+from inspect import signature
+from threading import Barrier, Event, Thread
 from unittest.mock import MagicMock
 
+import pytest
+
+from ftools.collection import getitem
 from ftools.callable import (
     fullname,
     rename,
     identity,
     deprecated,
+    deprecation_usage,
     curry,
+    CurriedPartial,
     currymethod,
     flow,
+    compose,
+    Flow,
     noop,
     constant,
     graceful,
+    graceful_stats,
     once,
     star,
+    debounce,
+    throttle,
+    memoize,
+    default_key,
 )
 
 
@@ -45,6 +62,52 @@ def test_deprecated():
         assert len(w) == 1
         assert issubclass(w[-1].category, DeprecationWarning)
         assert "tests.test_callable.f is deprecated" == str(w[-1].message)
+        assert w[-1].filename == __file__
+
+
+def test_deprecated_scope(monkeypatch):
+    def old(x):
+        return x
+
+    per_call_site = deprecated(old)
+    per_process = deprecated(scope="process")(old)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        for _ in range(3):
+            assert per_call_site(1) == 1
+        per_call_site(2)
+        assert len(w) == 2
+        per_process(1)
+        per_process(2)
+        assert len(w) == 3
+    usage = deprecation_usage()[f"{__name__}.old"]
+    assert sorted(usage.values()) == [1, 1, 1, 3]
+    assert all(site.startswith(__file__) for site in usage)
+
+    with pytest.raises(ValueError):
+        deprecated(old, scope="thread")
+    monkeypatch.setenv("FTOOLS_DISABLE_DEPRECATED", "1")
+    assert deprecated(old) is old
+
+
+def test_deprecated_threads():
+    def older(x):
+        return x
+
+    counted = deprecated(older)
+
+    def call():
+        for _ in range(1000):
+            counted(1)
+
+    threads = [Thread(target=call) for _ in range(4)]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert list(deprecation_usage()[f"{__name__}.older"].values()) == [4000]
 
 
 def test_curry():
@@ -57,7 +120,7 @@ def test_curry():
     def g(x, y):
         return x * 2 + y
 
-    assert isinstance(curry(g)(2), partial)
+    assert isinstance(curry(g)(2), CurriedPartial)
     assert curry(g)(2, 3) is 7
 
     @curry
@@ -70,6 +133,45 @@ def test_curry():
     assert h(1)(2, z=3) == 6
     assert h(1, z=3)(2) == 6
 
+    @curry
+    def k(x, *, y):
+        return x - y
+
+    assert k(3, y=1) == 2
+    assert k(3)(y=1) == 2
+    assert k(y=1)(3) == 2
+
+    try:
+        h(1, 2, 3, 4)
+    except TypeError as e:
+        assert e
+    else:
+        assert False
+
+
+def test_curried_partial():
+    @curry
+    def f(x, y, z, w=0):
+        return x + y + z + w
+
+    partial_f = f(1)(2, w=4)
+    assert isinstance(partial_f, CurriedPartial)
+    assert partial_f.func is f
+    assert partial_f.args == (1, 2)
+    assert partial_f.keywords == {"w": 4}
+    assert partial_f(3) == 10
+    assert partial_f(3, w=0) == 6
+    assert f(y=2)(1, z=3) == 6
+    assert str(signature(f(1))) == "(y, z, w=0)"
+
+
+def test_curried_partial_pickle():
+    get_g = pickle.loads(pickle.dumps(getitem("g")))
+    assert isinstance(get_g, CurriedPartial)
+    assert get_g.func is getitem
+    assert get_g.args == ("g",)
+    assert get_g({"g": 1}) == 1
+
 
 def test_currymethod():
     class A:
@@ -90,6 +192,27 @@ def test_currymethod():
 def test_flow():
     f = flow((lambda n: n * 2, str,))
     assert f(4) == str(4 * 2)
+    assert flow([str], 4) == "4"
+    assert flow([], 4) == 4
+
+
+def test_flow_unrolled():
+    increments = [lambda n: n + 1] * 6
+    for size in range(7):
+        composed = flow(iter(increments[:size]))
+        assert isinstance(composed, Flow)
+        assert composed(0) == size
+        assert composed(0) == size
+    assert compose([str, lambda n: n * 2], 4) == "8"
+    with pytest.raises(TypeError):
+        flow([str, None])
+
+
+def test_flow_hook():
+    timings = []
+    assert flow([abs, str], -1, hook=lambda *timing: timings.append(timing)) == "1"
+    assert [func for func, _ in timings] == [abs, str]
+    assert all(seconds >= 0 for _, seconds in timings)
 
 
 def test_noop():
@@ -114,12 +237,284 @@ def test_graceful():
     assert graceful_f() is None
 
 
+def test_graceful_options(caplog):
+    def parse(value):
+        return int(value)
+
+    assert graceful(parse, default=0)("x") == 0
+    assert graceful(parse, fallback=len)("xy") == 2
+    assert graceful(parse, ValueError)("1") == 1
+    with pytest.raises(TypeError):
+        graceful(parse, ValueError)(None)
+    with pytest.raises(TypeError):
+        graceful(parse, ValueError, 0)  # pylint: disable=too-many-function-args
+
+    caplog.clear()
+    rate_limited = graceful(parse, log_interval=60000)
+    for _ in range(5):
+        rate_limited("x")
+    assert len(caplog.records) == 1
+    assert "parse" in caplog.records[0].getMessage()
+    graceful(parse, sample_rate=0)("x")
+    assert len(caplog.records) == 1
+
+    stats = graceful_stats()[f"{__name__}.parse"]
+    assert stats["ValueError"] == 8
+
+
 def test_once():
     f = MagicMock()
     once_f = once(f)
     once_f()
     once_f()
     f.assert_called_once()
+    once_f.reset()
+    once_f()
+    assert f.call_count == 2
+
+
+def test_once_threads():
+    calls = []
+    barrier = Barrier(32)
+
+    def initialize():
+        calls.append(None)
+        time.sleep(0.01)
+        return object()
+
+    once_f = once(initialize)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(once_f())
+
+    threads = [Thread(target=call) for _ in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 32
+    assert all(result is results[0] for result in results)
+
+
+def test_once_exceptions():
+    f = MagicMock(side_effect=[ValueError(), 1, 2])
+    once_f = once(f)
+    with pytest.raises(ValueError):
+        once_f()
+    assert once_f() == 1
+    assert once_f() == 1
+
+    g = MagicMock(side_effect=[ValueError(), 1])
+    cached = once(g, cache_exceptions=True)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cached()
+    g.assert_called_once()
+
+
+def test_once_async():
+    calls = []
+
+    async def initialize():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise ValueError()
+        return len(calls)
+
+    once_f = once(initialize)
+
+    async def main():
+        with pytest.raises(ValueError):
+            await once_f()
+        return await asyncio.gather(*(once_f() for _ in range(10)))
+
+    assert asyncio.run(main()) == [2] * 10
+    assert asyncio.run(once_f()) == 2
+    assert len(calls) == 2
+    once_f.reset()
+    assert asyncio.run(once_f()) == 3
+
+
+def test_debounce():
+    f = MagicMock(return_value=1)
+    debounced = debounce(20, f)
+    for value in range(3):
+        assert debounced(value) is None
+    f.assert_not_called()
+    assert debounced.pending()
+    time.sleep(0.1)
+    f.assert_called_once_with(2)
+    assert not debounced.pending()
+    assert debounced(3) == 1
+
+
+def test_debounce_leading():
+    f = MagicMock(return_value=1)
+    debounced = debounce(50, f, leading=True, trailing=False)
+    assert debounced(1) == 1
+    debounced(2)
+    time.sleep(0.1)
+    f.assert_called_once_with(1)
+
+
+def test_debounce_cancel_flush():
+    f = MagicMock(return_value=1)
+    debounced = debounce(20)(f)
+    debounced()
+    debounced.cancel()
+    time.sleep(0.05)
+    f.assert_not_called()
+    assert not debounced.pending()
+    debounced(5)
+    assert debounced.flush() == 1
+    f.assert_called_once_with(5)
+    assert not debounced.pending()
+
+
+def test_debounce_threads():
+    f = MagicMock()
+    debounced = debounce(100, f)
+
+    def call():
+        for value in range(50):
+            debounced(value)
+
+    threads = [Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    time.sleep(0.3)
+    f.assert_called_once()
+
+
+def test_debounce_invokes_without_lock():
+    started = Event()
+    release = Event()
+
+    def f(value):
+        started.set()
+        release.wait(1)
+        return value
+
+    debounced = debounce(10, f)
+    debounced(1)
+    assert started.wait(1)
+    # f is running on the timer thread, calls don't wait for it
+    start = time.monotonic()
+    debounced(2)
+    assert debounced.pending()
+    assert time.monotonic() - start < 0.5
+    release.set()
+    assert debounced.flush() == 2
+
+
+def test_debounce_loop():
+    f = MagicMock()
+
+    async def main():
+        debounced = debounce(10, f, loop=asyncio.get_running_loop())
+        debounced(1)
+        debounced(2)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    f.assert_called_once_with(2)
+
+
+def test_throttle():
+    f = MagicMock()
+    throttled = throttle(30, f)
+    for _ in range(20):
+        throttled()
+        time.sleep(0.01)
+    throttled.flush()
+    assert 3 <= f.call_count < 20
+
+
+def test_memoize():
+    f = MagicMock(side_effect=lambda mapping, items: len(mapping) + len(items))
+    memoized = memoize(f)
+    assert memoized({"a": [1]}, [1, 2]) == 3
+    assert memoized({"a": [1]}, [1, 2]) == 3
+    assert memoized({"a": [2]}, [1, 2]) == 3
+    assert f.call_count == 2
+    assert memoized.cache_info() == (1, 2, 128, 2)
+    memoized.cache_clear()
+    assert memoized.cache_info() == (0, 0, 128, 0)
+    assert memoize(identity).__name__ == "identity"
+
+
+def test_memoize_eviction():
+    f = MagicMock(side_effect=identity)
+    memoized = memoize(maxsize=2)(f)
+    memoized(1)
+    memoized(2)
+    memoized(1)
+    memoized(3)
+    assert memoized.cache_info().currsize == 2
+    memoized(1)
+    memoized(2)
+    assert f.call_count == 4
+
+    expiring = memoize(ttl=20)(f)
+    expiring(1)
+    expiring(1)
+    time.sleep(0.05)
+    expiring(1)
+    assert expiring.cache_info().misses == 2
+
+
+def test_memoize_key():
+    memoized = memoize(key=len)(MagicMock(side_effect=identity))
+    assert memoized("ab") == "ab"
+    assert memoized("cd") == "ab"
+
+
+def test_memoize_curry():
+    f = MagicMock(side_effect=lambda x, y: x + y)
+
+    def add(x, y):
+        return f(x, y)
+
+    curried = curry(memoize(add))
+    assert curried(1)(2) == 3
+    assert curried(1, 2) == 3
+    f.assert_called_once_with(1, 2)
+    memoized = memoize(curry(add))
+    assert memoized(2, 3) == 5
+    assert memoized(2)(4) == 6
+
+
+def test_memoize_method():
+    calls = []
+
+    class Area:
+        def __init__(self, scale):
+            self.scale = scale
+
+        @memoize
+        def of(self, width, height):
+            calls.append((self, width, height))
+            return self.scale * width * height
+
+    area = Area(2)
+    assert area.of(2, 3) == 12
+    assert area.of(2, 3) == 12
+    assert Area(3).of(2, 3) == 18
+    assert len(calls) == 2
+    assert Area.of.cache_info().misses == 2
+
+
+def test_default_key():
+    assert default_key({"a": [1, {2}]}) == default_key({"a": [1, {2}]})
+    assert default_key([1]) != default_key((1,))
+    assert default_key(1, b=2) != default_key(1, 2)
+    hash(default_key({"a": [1, {2}]}))
 
 
 def test_star():
@@ -1,14 +1,20 @@
+import pytest
 from ftools.collection import (
     to_path,
     getitem,
     hasitem,
     setitem,
+    setitems,
     delitem,
     update,
     branches,
     leaves,
     pick,
+    compile_path,
+    getitem_many,
+    LinkedPath,
 )
+from ftools.persistent import PersistentMap, PersistentVector, freeze, thaw
 
 
 def test_to_path():
@@ -39,6 +45,53 @@ def test_hasitem():
     assert hasitem(("key", 0, "subkey"), {"key": [{"subkey": "item"}]}) == True
 
 
+@pytest.mark.parametrize(
+    "path",
+    [
+        "a",
+        ("a", "b"),
+        ("a", "b", 0),
+        ("a", "b", 0, "c"),
+        ("a", "b", 0, "c", "d"),
+        ("a", "b", 0, "c", "d", 1),
+    ],
+)
+def test_compile_path(path):
+    document = {"a": {"b": [{"c": {"d": [1, 2]}}]}}
+    compiled = compile_path(path)
+    assert compiled.path == to_path(path)
+    assert compiled(document) == getitem(path, document)
+    assert compiled.get(document) == getitem(path, document)
+    assert compiled.has(document) is True
+    assert compiled.get({}) is None
+    assert compiled.has({"b": []}) is False
+    assert compiled.set(3, document) == setitem(path, 3, document)
+    assert list(map(compiled, [document, {}])) == [getitem(path, document), None]
+
+
+def test_getitem_many():
+    records = [
+        {"a": {"b": 1, "c": [2]}, "d": 3},
+        {"a": {"b": 4}},
+        {"a": 5},
+    ]
+    paths = [("a", "b"), ("a", "c", 0), "d", ("a", "b"), ()]
+    assert getitem_many(paths, records) == [
+        [getitem(path, record) for record in records] for path in paths
+    ]
+    assert getitem_many(["d"])(iter(records)) == [[3, None, None]]
+    assert getitem_many([], records) == []
+    with pytest.raises(TypeError):
+        getitem_many(iter(paths), records)
+
+
+def test_getitem_many_as_arrays():
+    numpy = pytest.importorskip("numpy")
+    columns = getitem_many(["a", "b"], [{"a": 1, "b": 2}], as_arrays=True)
+    assert all(isinstance(column, numpy.ndarray) for column in columns)
+    assert [column.tolist() for column in columns] == [[1], [2]]
+
+
 def test_setitem():
     assert setitem("key", 4, {}) == {"key": 4}
     assert setitem(("key", "subkey"), 4, {}) == {"key": {"subkey": 4}}
@@ -46,10 +99,30 @@ def test_setitem():
     assert setitem(("key", 1), 4, {}) == {"key": [None, 4]}
     assert setitem(("key", 1), 4, {"key": [1, 2]}) == {"key": [1, 4]}
 
+    collection = {"key": {"subkey": 1}, "other": {"subkey": 2}}
+    result = setitem(("key", "subkey"), 4, collection)
+    assert result == {"key": {"subkey": 4}, "other": {"subkey": 2}}
+    assert collection == {"key": {"subkey": 1}, "other": {"subkey": 2}}
+    assert result["other"] is collection["other"]
+
+
+def test_setitems():
+    collection = {"key": {"a": 1, "b": 2}, "other": [1]}
+    result = setitems({("key", "a"): 3, ("key", "b"): 4, ("new", 1): 5}, collection)
+    assert result == {"key": {"a": 3, "b": 4}, "other": [1], "new": [None, 5]}
+    assert collection == {"key": {"a": 1, "b": 2}, "other": [1]}
+    assert result["other"] is collection["other"]
+    assert setitems({"key": {}, ("key", "a"): 1}, collection) == {
+        "key": {"a": 1},
+        "other": [1],
+    }
+    assert setitems({}, collection) == collection
+
 
 def test_delitem():
     assert delitem("key", {"key": 4}) == {}
     assert delitem(("key", "subkey"), {"key": {"subkey": 4}}) == {"key": {}}
+    assert delitem(("key", 0), {"key": [1, 2]}) == {"key": [2]}
 
 
 def test_update():
@@ -57,6 +130,9 @@ def test_update():
     assert update(
         ("key", "subkey"), lambda value: value * 2, {"key": {"subkey": 4}}
     ) == {"key": {"subkey": 8}}
+    assert update(("key", "subkey"), lambda value: value, {}) == {
+        "key": {"subkey": None}
+    }
 
 
 def test_branches():
@@ -73,6 +149,47 @@ def test_branches():
     ]
 
 
+def test_branches_options():
+    document = {"a": {"b": {"c": 1}}, "d": [1, {"e": 2}]}
+    assert list(branches(document, max_depth=1)) == [
+        (("a",), {"b": {"c": 1}}),
+        (("d",), [1, {"e": 2}]),
+    ]
+    assert [path for path, _ in branches(document, max_depth=2)] == [
+        ("a",),
+        ("a", "b"),
+        ("d",),
+        ("d", 0),
+        ("d", 1),
+    ]
+    assert [
+        path for path, _ in branches(document, prune=lambda path, _: path == ("a",))
+    ] == [("a",), ("d",), ("d", 0), ("d", 1), ("d", 1, "e")]
+    assert [path for path, _ in branches(document, path_type=list)][2] == [
+        "a",
+        "b",
+        "c",
+    ]
+    linked = [path for path, _ in branches(document, path_type=LinkedPath)]
+    assert linked == [path for path, _ in branches(document)]
+    assert linked[2].parent is linked[1]
+    assert len(linked[2]) == 3
+    assert getitem(linked[2], document) == 1
+    assert list(branches(document, max_depth=0)) == []
+    with pytest.raises(TypeError):
+        branches(document, path_type=set)
+
+
+def test_branches_deep():
+    document: list = []
+    cursor = document
+    for _ in range(3000):
+        cursor.append([])
+        cursor = cursor[0]
+    cursor.append("leaf")
+    assert list(leaves(document)) == [((0,) * 3001, "leaf")]
+
+
 def test_leaves():
     assert list(leaves({"a": 1})) == [(("a",), 1)]
     assert list(leaves({"a": {"b": {"c": 1}}})) == [
@@ -82,6 +199,8 @@ def test_leaves():
     assert list(leaves([[1]])) == [(((0, 0), 1))]
     assert list(leaves([{"a": 1}])) == [(((0, "a"), 1))]
     assert list(leaves([{"a": [1]}])) == [(((0, "a", 0), 1))]
+    assert list(leaves({"a": {"b": 1}, "c": 2}, max_depth=1)) == [(("c",), 2)]
+    assert list(leaves({"a": 1}, max_depth=0)) == []
 
 
 def test_pick():
@@ -90,3 +209,27 @@ def test_pick():
     assert pick({("a", "b")}, {"a": {"b": 1}}) == {"a": {"b": 1}}
     assert pick({("a", "b"), "c"}, {"a": {"b": 1}, "c": 3}) == {"a": {"b": 1}, "c": 3}
     assert pick({("a", 1, "b")}, {"a": [{"d": 2}, {"b": 3}]}) == {"a": [{"b": 3}]}
+
+
+def test_persistent():
+    document = freeze({"a": {"b": [1, 2]}, "c": {"d": 1}})
+    changed = setitem(("a", "b", 0), 3, document)
+    assert isinstance(changed, PersistentMap)
+    assert isinstance(changed["a"]["b"], PersistentVector)
+    assert thaw(changed) == {"a": {"b": [3, 2]}, "c": {"d": 1}}
+    assert changed["c"] is document["c"]
+    assert thaw(document) == {"a": {"b": [1, 2]}, "c": {"d": 1}}
+    created = setitem(("e", 0), 1, document)
+    assert isinstance(created["e"], PersistentVector)
+    assert thaw(created["e"]) == [1]
+    assert thaw(delitem(("a", "b", 1), document)) == {"a": {"b": [1]}, "c": {"d": 1}}
+    assert getitem(("a", "b", 1), update(("a", "b", 1), str, document)) == "2"
+    assert thaw(pick({("a", "b", 0), "c"}, document)) == {
+        "a": {"b": [1]},
+        "c": {"d": 1},
+    }
+    assert sorted(path for path, _ in leaves(document)) == [
+        ("a", "b", 0),
+        ("a", "b", 1),
+        ("c", "d"),
+    ]
@@ -0,0 +1,68 @@
+import subprocess
+import sys
+
+import ftools
+from ftools import collection, instrument, iterable, persistent
+
+
+def imported_modules(code):
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}; import sys; print(*sys.modules)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_exports():
+    for name in ftools.__all__:
+        assert getattr(ftools, name) is not None
+    assert ftools.getitem is collection.getitem
+    assert ftools.freeze is persistent.freeze
+    assert ftools.pmap is persistent.pmap
+    assert ftools.parallel.group_by is not ftools.group_by
+    assert "getitem" in dir(ftools)
+    assert "aiterable" in dir(ftools)
+    assert not {"_module", "_names", "_name"} & set(dir(ftools))
+
+
+def test_ambiguous_exports():
+    for name in ("pick", "omit", "create_empty"):
+        assert name not in ftools.__all__
+        try:
+            getattr(ftools, name)
+        except AttributeError as error:
+            assert "ftools.mapping" in str(error)
+        else:
+            assert False
+
+
+def test_exports_follow_instrumentation():
+    instrument.enable()
+    try:
+        assert ftools.chunk is iterable.chunk
+    finally:
+        instrument.disable()
+    assert ftools.chunk is iterable.chunk
+
+
+def test_missing_attribute():
+    try:
+        ftools.missing  # pylint: disable=pointless-statement
+    except AttributeError as error:
+        assert "missing" in str(error)
+    else:
+        assert False
+
+
+def test_lazy_import():
+    modules = imported_modules("import ftools")
+    assert "ftools" in modules
+    assert not {module for module in modules if module.startswith("ftools.")}
+
+    modules = imported_modules("import ftools; ftools.getitem")
+    assert "ftools.collection" in modules
+    assert "ftools.parallel" not in modules
+    for heavy in ("asyncio", "logging", "tempfile", "pickle", "concurrent.futures"):
+        assert heavy not in modules
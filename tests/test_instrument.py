@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+from ftools import (
+    callable as callable_module,
+    collection,
+    instrument,
+    iterable,
+    mapping,
+)
+
+
+@pytest.fixture
+def enabled():
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_enable_disable():
+    original = iterable.group_by
+    instrument.enable()
+    instrument.enable()
+    assert instrument.is_enabled()
+    assert iterable.group_by is not original
+    assert iterable.group_by.__name__ == "group_by"
+    instrument.disable()
+    assert not instrument.is_enabled()
+    assert iterable.group_by is original
+
+
+def test_snapshot(enabled):
+    assert iterable.group_by(len, ["a", "bb", "c"]) == {1: ["a", "c"], 2: ["bb"]}
+    assert mapping.pick(["a"])({"a": 1, "b": 2}) == {"a": 1}
+    assert mapping.pick(["a"])({"a": 1}) == {"a": 1}
+    with pytest.raises(ZeroDivisionError):
+        iterable.find(lambda value: 1 / value, [0])
+    snapshot = instrument.snapshot()
+    assert snapshot["ftools.iterable.group_by"]["calls"] == 1
+    assert snapshot["ftools.iterable.group_by"]["items"] == 3
+    assert snapshot["ftools.iterable.group_by"]["seconds"] >= 0
+    assert snapshot["ftools.mapping.pick"]["calls"] == 2
+    assert snapshot["ftools.mapping.pick"]["items"] == 3
+    assert snapshot["ftools.iterable.find"]["calls"] == 1
+    assert "ftools.mapping.omit" not in snapshot
+
+
+def test_curried_partials(enabled):
+    get_a = collection.getitem("a")
+    assert isinstance(get_a, callable_module.CurriedPartial)
+    assert get_a({"a": 1}) == 1
+    assert get_a(collection={"a": 3}) == 3
+    assert pickle.loads(pickle.dumps(get_a))({"a": 2}) == 2
+    assert instrument.snapshot()["ftools.collection.getitem"]["calls"] == 3
+
+
+def test_decorators_not_instrumented():
+    original = callable_module.curry
+    instrument.reset()
+    instrument.enable()
+    try:
+        assert callable_module.curry is original
+        callable_module.curry(len)
+        callable_module.memoize(len)
+        assert not instrument.snapshot()
+    finally:
+        instrument.disable()
+
+
+def test_prometheus(enabled):
+    iterable.uniq([1, 1])
+    text = instrument.prometheus()
+    assert "# TYPE ftools_calls_total counter" in text
+    assert 'ftools_calls_total{function="ftools.iterable.uniq"} 1' in text
+    assert 'ftools_input_items_total{function="ftools.iterable.uniq"} 2' in text
+
+
+def test_wrapper_names():
+    assert callable_module.once(iterable.compact).__code__.co_name == "compact"
+    assert iterable.group_by.__code__.co_name == "group_by"
+    assert callable_module.graceful(len).__code__.co_name == "len"
+    assert callable_module.deprecated(iterable.head).__code__.co_name == "head"
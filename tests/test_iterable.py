@@ -1,3 +1,4 @@
+import math
 import pytest
 from ftools.iterable import (
     compact,
@@ -7,9 +8,20 @@ from ftools.iterable import (
     mean,
     flatten,
     group_by,
+    group_by_sorted,
+    group_reduce,
+    external_group_by,
     intersection,
+    intersection_by,
+    difference,
+    difference_by,
+    union,
+    union_by,
+    symmetric_difference,
+    symmetric_difference_by,
     chunk_by,
     chunk,
+    chunk_slices,
     uniq,
     key_by,
     uniq_by,
@@ -50,10 +62,27 @@ def test_find_index():
 
 def test_mean():
     assert mean((1, 2, 3)) == 2
+    assert mean(iter((1, 2, 3))) == 2
+    assert mean(item for item in (1, 2)) == 1.5
+    assert math.isnan(mean(()))
+    assert math.isnan(mean(iter(())))
 
 
 def test_flatten():
     assert tuple(flatten((1, 2, 3, (4, 5)))) == (1, 2, 3, 4, 5)
+    assert tuple(flatten((1, [2, [3, [4]]]))) == (1, 2, 3, 4)
+    assert tuple(flatten((1, [2, [3, [4]]]), depth=1)) == (1, 2, [3, [4]])
+    assert tuple(flatten((1, [2, [3, [4]]]), depth=2)) == (1, 2, 3, [4])
+    assert tuple(flatten((1, [2]), depth=0)) == (1, [2])
+    assert tuple(flatten(("ab", [b"cd", {"e": 1}]))) == ("ab", b"cd", {"e": 1})
+    assert tuple(flatten(("ab", ["cd"]), depth=1, atoms=())) == ("a", "b", "cd")
+
+
+def test_flatten_deep():
+    nested: list = [1]
+    for _ in range(5000):
+        nested = [nested]
+    assert tuple(flatten(nested)) == (1,)
 
 
 def test_group_by():
@@ -63,6 +92,35 @@ def test_group_by():
     }
 
 
+def test_group_by_sorted():
+    assert list(group_by_sorted(lambda person: person.get("location"), PEOPLE)) == [
+        ("New York City", [PEOPLE[0]]),
+        ("Tel Aviv", [PEOPLE[1], PEOPLE[2]]),
+    ]
+    assert list(group_by_sorted(lambda item: item % 2, iter((1, 3, 2, 5)))) == [
+        (1, [1, 3]),
+        (1, [5]),
+    ]
+
+
+def test_group_reduce():
+    assert group_reduce(
+        lambda person: person.get("location"),
+        lambda count, _: count + 1,
+        0,
+        PEOPLE,
+    ) == {"New York City": 1, "Tel Aviv": 2}
+
+
+@pytest.mark.parametrize("max_items", [1, 3, 1000])
+def test_external_group_by(max_items):
+    items = [(index % 7, index) for index in range(100)]
+    groups = external_group_by(
+        lambda item: item[0] + 1, items, max_items=max_items, partitions=3
+    )
+    assert dict(groups) == group_by(lambda item: item[0] + 1, items)
+
+
 def test_flat_group_by():
     iteratee = lambda person: person.get("location")
     groups = flat_group_by(iteratee, PEOPLE)
@@ -84,6 +142,37 @@ def test_key_by():
 
 def test_intersection():
     assert tuple(intersection((1, 2), (2, 3))) == (2,)
+    assert tuple(intersection((3, 2, 2, 1), (1, 2, 2))) == (2, 1)
+    assert tuple(intersection((3, 2, 1), (1, 2, 2, 4, 5))) == (2, 1)
+    assert tuple(intersection(iter((3, 2, 1)), {1, 2})) == (2, 1)
+    assert tuple(intersection((1, 2), ())) == ()
+    assert len(tuple(intersection(range(100000), range(50000, 150000)))) == 50000
+
+
+def test_intersection_by():
+    first, second = {"id": 1}, {"id": 1}
+    assert tuple(intersection_by(lambda item: item["id"], [first], [second])) == (
+        first,
+    )
+    assert tuple(intersection_by(abs, (-1, -2), (2, 3, 4))) == (-2,)
+
+
+def test_difference():
+    assert tuple(difference((1, 2, 2, 3), (2,))) == (1, 3)
+    assert tuple(difference_by(abs, (-1, -2), (2,))) == (-1,)
+
+
+def test_union():
+    assert tuple(union((1, 2, 1), (3, 2))) == (1, 2, 3)
+    assert tuple(union_by(abs, (-1, 2), (1, 3))) == (-1, 2, 3)
+
+
+def test_symmetric_difference():
+    assert tuple(symmetric_difference((1, 2, 2), (2, 3, 3))) == (1, 3)
+    assert tuple(symmetric_difference_by(abs, iter((-1, 2)), iter((1, 3)))) == (
+        2,
+        3,
+    )
 
 
 def test_chunk_by():
@@ -92,11 +181,29 @@ def test_chunk_by():
         (15, 25),
         (30,),
     )
+    # Identities above 256 are not cached ints, equal ones are distinct objects
+    assert tuple(chunk_by(lambda item, index: item // 10, range(3000, 6000))) == tuple(
+        tuple(range(start, start + 10)) for start in range(3000, 6000, 10)
+    )
 
 
 def test_chunk():
     assert tuple(chunk(2, (1, 2, 3, 4))) == ((1, 2), (3, 4))
     assert tuple(chunk(2, (1, 2, 3, 4, 5))) == ((1, 2), (3, 4), (5,))
+    assert tuple(chunk(2, iter(()))) == ()
+    assert all(len(item) == 2 for item in chunk(2, range(2000)))
+    with pytest.raises(ValueError):
+        chunk(0, (1, 2))
+
+
+def test_chunk_slices():
+    assert list(chunk_slices(2, [1, 2, 3, 4, 5])) == [[1, 2], [3, 4], [5]]
+    assert list(chunk_slices(2, "abc")) == ["ab", "c"]
+    data = bytearray(b"abcde")
+    chunks = list(chunk_slices(2, data))
+    assert [bytes(item) for item in chunks] == [b"ab", b"cd", b"e"]
+    data[0] = ord("z")
+    assert bytes(chunks[0]) == b"zb"
 
 
 def test_uniq():
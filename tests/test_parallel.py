@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+import pytest
+from ftools import iterable, mapping
+from ftools.collection import getitem
+from ftools.parallel import (
+    chunk_size,
+    parallel_map,
+    group_by,
+    key_by,
+    partition,
+    map_values,
+    map_keys,
+    pick_by_value,
+    pick_by_key,
+)
+
+ITEMS = [(index % 5, index) for index in range(100)]
+MAPPING = OrderedDict((str(index), index) for index in range(100, 0, -1))
+
+
+def is_even(item):
+    return item[1] % 2 == 0
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(3) as pool:
+        yield pool
+
+
+def test_chunk_size():
+    assert chunk_size(100, 4) == 7
+    assert chunk_size(0, 4) == 1
+    assert chunk_size(3, 8) == 1
+
+
+def test_parallel_map(executor):
+    assert list(parallel_map(str, range(10), executor)) == list(map(str, range(10)))
+    assert list(parallel_map(str, range(10), workers=1)) == list(map(str, range(10)))
+    assert list(parallel_map(str, [], executor)) == []
+
+
+def test_group_by(executor):
+    expected = iterable.group_by(itemgetter(0), ITEMS)
+    result = group_by(itemgetter(0), ITEMS, executor=executor)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_group_by_processes():
+    assert group_by(itemgetter(0), ITEMS, workers=2) == iterable.group_by(
+        itemgetter(0), ITEMS
+    )
+    records = [{"g": index % 3, "id": index} for index in range(30)]
+    assert group_by(getitem("g"), records, workers=2) == iterable.group_by(
+        getitem("g"), records
+    )
+
+
+def test_key_by(executor):
+    assert key_by(itemgetter(0), ITEMS, executor=executor) == iterable.key_by(
+        itemgetter(0), ITEMS
+    )
+
+
+def test_partition(executor):
+    assert partition(is_even, ITEMS, executor=executor) == iterable.partition(
+        is_even, ITEMS
+    )
+
+
+def test_map_values(executor):
+    result = map_values(str, MAPPING, executor=executor)
+    assert isinstance(result, OrderedDict)
+    assert list(result.items()) == list(mapping.map_values(str, MAPPING).items())
+    assert map_values(abs, MAPPING, workers=2) == MAPPING
+
+
+def test_map_keys(executor):
+    result = map_keys(int, MAPPING, executor=executor)
+    assert isinstance(result, OrderedDict)
+    assert list(result.items()) == list(mapping.map_keys(int, MAPPING).items())
+
+
+def test_pick_by(executor):
+    assert pick_by_value(bool, {"a": 0, "b": 1}, executor=executor) == {"b": 1}
+    assert pick_by_key(str.isdigit, {"a": 0, "1": 1}, executor=executor) == {"1": 1}
+    assert pick_by_value(bool, {}, executor=executor) == {}
@@ -0,0 +1,152 @@
+import pickle
+from copy import copy
+
+import pytest
+from ftools.persistent import (
+    PersistentMap,
+    PersistentVector,
+    pmap,
+    pvector,
+    freeze,
+    thaw,
+)
+
+
+class Colliding:
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and other.value == self.value
+
+    def __repr__(self):
+        return f"Colliding({self.value})"
+
+
+def test_pmap():
+    mapping = pmap({"a": 1, "b": 2})
+    assert isinstance(mapping, PersistentMap)
+    assert mapping == {"a": 1, "b": 2}
+    assert mapping["a"] == 1
+    assert mapping.get("c") is None
+    assert "b" in mapping
+    assert len(mapping) == 2
+    assert pmap() == {}
+    with pytest.raises(KeyError):
+        mapping["c"]
+
+
+def test_pmap_set_delete():
+    mapping = pmap()
+    versions = []
+    for i in range(2000):
+        mapping = mapping.set(i, str(i))
+        versions.append(mapping)
+    assert len(mapping) == 2000
+    assert dict(mapping.items()) == {i: str(i) for i in range(2000)}
+    assert len(versions[9]) == 10
+    assert mapping.set(5, mapping[5]) is mapping
+    assert mapping.set(5, "five")[5] == "five"
+    for i in range(0, 2000, 2):
+        mapping = mapping.delete(i)
+    assert sorted(mapping) == list(range(1, 2000, 2))
+    assert len(versions[-1]) == 2000
+    with pytest.raises(KeyError):
+        mapping.delete(0)
+
+
+def test_pmap_collisions():
+    keys = [Colliding(i) for i in range(5)]
+    mapping = pmap({key: key.value for key in keys}).set("other", -1)
+    assert all(mapping[key] == key.value for key in keys)
+    assert len(mapping) == 6
+    mapping = mapping.delete(keys[0]).delete(keys[1])
+    assert keys[0] not in mapping
+    assert mapping[keys[2]] == 2
+    for key in keys[2:]:
+        mapping = mapping.delete(key)
+    assert mapping == {"other": -1}
+
+
+def test_pmap_evolver():
+    mapping = pmap({"a": 1})
+    evolver = mapping.evolver()
+    evolver["b"] = 2
+    del evolver["a"]
+    assert evolver.persistent() == {"b": 2}
+    assert mapping == {"a": 1}
+    assert mapping.update({"c": 3}) == {"a": 1, "c": 3}
+
+
+def test_pvector():
+    vector = pvector([1, 2, 3])
+    assert isinstance(vector, PersistentVector)
+    assert vector == [1, 2, 3]
+    assert vector[-1] == 3
+    assert vector[1:] == [2, 3]
+    assert len(vector) == 3
+    assert pvector() == []
+    with pytest.raises(IndexError):
+        vector[3]
+
+
+@pytest.mark.parametrize("size", [0, 1, 32, 33, 1056, 1057, 33 * 1024 + 5])
+def test_pvector_append_pop(size):
+    vector = pvector()
+    for i in range(size):
+        vector = vector.append(i)
+    assert list(vector) == list(range(size))
+    assert pvector(range(size)) == vector
+    assert all(vector[i] == i for i in range(0, size, 7))
+    for i in range(size):
+        vector = vector.pop()
+        assert len(vector) == size - i - 1
+    assert vector == []
+
+
+def test_pvector_set():
+    vector = pvector(range(2000))
+    changed = vector.set(5, "a").set(1999, "b").set(2000, "c")
+    assert changed[5] == "a"
+    assert changed[1999] == "b"
+    assert changed[2000] == "c"
+    assert vector[5] == 5
+    assert len(vector) == 2000
+
+
+def test_pvector_delete_insert():
+    vector = pvector([1, 2, 3])
+    assert vector.delete(0) == [2, 3]
+    assert vector.delete(-1) == [1, 2]
+    assert vector.insert(1, 4) == [1, 4, 2, 3]
+    assert vector.insert(3, 4) == [1, 2, 3, 4]
+
+
+def test_pvector_evolver():
+    vector = pvector([1, 2])
+    evolver = vector.evolver()
+    evolver.append(3)
+    evolver[0] = 0
+    del evolver[1]
+    assert evolver.persistent() == [0, 3]
+    assert vector == [1, 2]
+
+
+def test_copy_and_pickle():
+    mapping = pmap({"a": pvector([1])})
+    assert copy(mapping) is mapping
+    assert pickle.loads(pickle.dumps(mapping)) == mapping
+
+
+def test_freeze_thaw():
+    document = {"a": [{"b": 1}], "c": "d"}
+    frozen = freeze(document)
+    assert isinstance(frozen, PersistentMap)
+    assert isinstance(frozen["a"], PersistentVector)
+    assert isinstance(frozen["a"][0], PersistentMap)
+    thawed = thaw(frozen)
+    assert thawed == document
+    assert type(thawed["a"]) is list
@@ -0,0 +1,78 @@
+from functools import partial
+
+import pytest
+from ftools.callable import flow
+from ftools.iterable import chunk, compact, find, flatten, head, uniq, uniq_by
+from ftools.pipeline import Pipeline
+
+ITEMS = [0, 1, 2, 2, None, 3, 4, 4, 5, 0, 6]
+
+
+def test_pipeline():
+    pipeline = Pipeline().compact().uniq().map(lambda item: item * 10).chunk(2)
+    assert list(pipeline(ITEMS)) == [(10, 20), (30, 40), (50, 60)]
+    assert list(pipeline(ITEMS)) == [(10, 20), (30, 40), (50, 60)]
+    assert list(pipeline([])) == []
+
+
+def test_pipeline_stages():
+    assert list(Pipeline().filter(lambda item: item % 2)(range(6))) == [1, 3, 5]
+    assert list(Pipeline().uniq_by(len)(["a", "b", "cc", "dd"])) == ["a", "cc"]
+    pairs = [(1, 2), (3, 3), (4, 5)]
+    assert list(Pipeline().starfilter(lambda a, b: a < b)(pairs)) == [(1, 2), (4, 5)]
+    assert list(Pipeline().flatten()([[1, [2]], [3]])) == [1, 2, 3]
+    assert list(Pipeline().flatten(1)([[1, [2]], [3]])) == [1, [2], 3]
+    assert Pipeline().apply(sum)([1, 2, 3]) == 6
+    assert list(Pipeline()(ITEMS)) == ITEMS
+
+
+def test_pipeline_terminal():
+    consumed = []
+
+    def record(item):
+        consumed.append(item)
+        return item
+
+    pipeline = Pipeline().map(record).compact().find(lambda item: item > 2)
+    assert pipeline(ITEMS) == 3
+    assert consumed == [0, 1, 2, 2, None, 3]
+    assert Pipeline().compact().head()(ITEMS) == 1
+    assert Pipeline().compact().head()([None, 0]) is None
+    assert Pipeline().chunk(2).map(sum).find(lambda total: total > 4)(ITEMS[:4]) is None
+    with pytest.raises(ValueError):
+        Pipeline().head().map(str)
+    with pytest.raises(ValueError):
+        Pipeline().chunk(0)
+
+
+def test_pipeline_from_funcs():
+    funcs = [
+        compact,
+        uniq,
+        partial(map, str),
+        partial(filter, None),
+        chunk(2),
+        flatten,
+        partial(uniq_by, len),
+        find(lambda item: item == "3"),
+    ]
+    pipeline = Pipeline.from_funcs(funcs)
+    assert pipeline(ITEMS) == flow(funcs, ITEMS)
+    assert [kind for kind, _ in pipeline.stages] == [
+        "compact",
+        "uniq",
+        "map",
+        "compact",
+        "chunk",
+        "flatten",
+        "uniq_by",
+        "find",
+    ]
+    assert Pipeline.from_funcs([compact, sorted, head])(ITEMS) == 1
+    assert Pipeline.from_funcs([compact, sorted]).stages[-1] == ("apply", sorted)
+
+
+def test_pipeline_explain():
+    pipeline = Pipeline.from_funcs([compact, uniq, partial(map, str), chunk(100)])
+    assert pipeline.explain() == "1. compact > uniq > map\n2. chunk"
+    assert Pipeline().compact().find(bool).explain() == "1. compact > find"
@@ -0,0 +1,59 @@
+import math
+import statistics
+from array import array
+
+import pytest
+from ftools.stats import OnlineStats, describe
+
+VALUES = [4.0, 7.0, 13.0, 16.0, 1e9 + 4.0, -3.5]
+
+
+def assert_describes(stats, values):
+    assert stats.count == len(values)
+    assert stats.sum == pytest.approx(sum(values))
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+    assert stats.sample_variance == pytest.approx(statistics.variance(values))
+    assert stats.stdev == pytest.approx(statistics.pstdev(values))
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+
+
+def test_add():
+    stats = OnlineStats()
+    for value in VALUES:
+        stats.add(value)
+    assert_describes(stats, VALUES)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pytest.param(VALUES, id="list"),
+        pytest.param(tuple(VALUES), id="tuple"),
+        pytest.param(array("d", VALUES), id="array"),
+        pytest.param(iter(VALUES), id="iterator"),
+    ],
+)
+def test_describe(values):
+    assert_describes(describe(values), VALUES)
+
+
+def test_describe_ndarray():
+    numpy = pytest.importorskip("numpy")
+    assert_describes(describe(numpy.array(VALUES)), VALUES)
+
+
+def test_merge():
+    first = describe(VALUES[:2])
+    second = describe(iter(VALUES[2:]))
+    assert_describes(first.merge(second).merge(OnlineStats()), VALUES)
+    assert_describes(OnlineStats().merge(describe(VALUES)), VALUES)
+
+
+def test_empty():
+    stats = describe([])
+    assert stats.count == 0
+    assert math.isnan(stats.mean)
+    assert math.isnan(stats.variance)
+    assert stats.min is None